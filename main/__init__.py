@@ -1,4 +1,4 @@
-from main.utils import LoggerSetup, Saver
+from main.utils import LoggerSetup, Saver, DiskCache, NltkResources, LLMRegistry
 from main.cv import CvProcessing
 from main.processing import BaseProcessing
 from main.jobDescription import DescProcessing
@@ -9,9 +9,14 @@ from main.generation import Generation
 from main.generationOutput import EvaluationReport, Decision, SectionEvaluation, OverallScore
 from main.summary_translation import SummaryTranslation
 from main.summaryOutput import SummaryOutput
+from main.language_detection import LanguageDetector
+from main.section_splitter import SectionSplitter
 __all__ = [
     "LoggerSetup",
     "Saver",
+    "DiskCache",
+    "NltkResources",
+    "LLMRegistry",
     "CvProcessing",
     "BaseProcessing",
     "DescProcessing",
@@ -25,5 +30,7 @@ __all__ = [
     "OverallScore",
     "SummaryTranslation",
     "SummaryOutput",
+    "LanguageDetector",
+    "SectionSplitter",
 ]
 
@@ -1,26 +1,260 @@
+import io
+import os
 import re
-from main import LoggerSetup
-import inflect
-import nltk
+import string
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Sequence, Tuple, Union
+from main import LoggerSetup, NltkResources
+from main.language_detection import LanguageDetector
 from nltk.corpus import stopwords
 from nltk.tokenize import word_tokenize
 from nltk.stem import WordNetLemmatizer
 from nltk.stem.porter import PorterStemmer 
+
+# Normalisation patterns are compiled once per process. Rules touching disjoint
+# characters are fused into a single pass, and rules for rare artefacts are only
+# run when a cheap substring check finds them. The output stays byte-identical
+# to applying the original rules one after another.
+_DEFAULT_HEADER_PATTERNS = [r'^.*Header.*$']
+_DEFAULT_FOOTER_PATTERNS = [r'^.*Footer.*$']
+_DEFAULT_HEADERS_FOOTERS = re.compile(r'^.*(?:Header|Footer).*$', re.MULTILINE)
+_NON_PRINTABLE = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]')
+# Anything but letters, numbers, whitespace and common punctuation. List markers
+# (►▪■●✓➤...) fall in this class too, so they need no separate rule
+_UNWANTED_CHARACTERS = re.compile(r'[^\w\s.,;:!?\-()\[\]{}@#$%&*+=/\n\r\t\'"°•·]')
+_REPEATED_PUNCTUATION = re.compile(r'([.,;:!?\-]){2,}')
+_DEFAULT_REPEATED_PATTERN = r'\.{2,}'
+_REPEATED_DOTS = re.compile(_DEFAULT_REPEATED_PATTERN)
+_REPEATED_DASHES_UNDERSCORES = re.compile(r'([-_])\1{2,}')
+_REPEATED_EQUALS = re.compile(r'={3,}')
+_REPEATED_SPACES = re.compile(r' {2,}')
+_LINE_EDGE_SPACES = re.compile(r'^ +| +$', re.MULTILINE)
+_SPACE_BEFORE_PUNCTUATION = re.compile(r'\s+([.,;:!?)])')
+_MISSING_SPACE_AFTER_PUNCTUATION = re.compile(r'([.,;:!?])([^\s\d])')
+_EXCESS_NEWLINES = re.compile(r'\n{3,}')
+_BROKEN_LINE = re.compile(r'([a-z,])\n([a-z])')
+_NUMBER = re.compile(r'\b\d+\b')
+
+# Cleaning profiles: the steps to run, in order. "translate" calls the
+# translation_callback given to run() and is skipped when there is none.
+# Steps from TOKEN_STEPS share one token list; the text is tokenized before
+# the first of them and joined back before the next text step (or at the end).
+TOKEN_STEPS = ("stopwords", "stem", "lemmatize", "dedupe")
+# Steps of the compiled normalisation engine (see check_normalisation_golden)
+NORMALISATION_STEPS = ("headers_footers", "special_characters", "repeated_substrings", "extra_spaces", "extra_newlines")
+CLEANING_PROFILES = {
+    # Layout repair only, the text keeps its case, numbers and wording
+    "minimal": ("headers_footers", "extra_spaces", "extra_newlines", "translate"),
+    # Normalised prose for LLM extraction and embeddings, no NLTK steps
+    "embedding": (
+        "headers_footers", "special_characters", "repeated_substrings",
+        "extra_spaces", "extra_newlines", "lowercase", "translate"
+    ),
+    # Every step, the historical behaviour of run()
+    "full": (
+        "headers_footers", "special_characters", "repeated_substrings",
+        "extra_spaces", "extra_newlines", "lowercase", "translate",
+        "numbers_to_words", "stopwords", "stem", "lemmatize", "dedupe"
+    ),
+}
+
+# Streaming mode cuts the input only in a whitespace gap spanning a line break,
+# between two characters no cleaning rule can reach across: the character before
+# must survive every text step (and not be a sentence final period when tokens
+# are produced), the one after must be an ASCII letter or digit, and neither
+# line may be a header/footer line. The gap itself is cleaned on its own.
+STREAM_CHUNK_CHARS = 64 * 1024
+# Without any safe cut, a chunk is cut anyway at this multiple of the chunk size
+STREAM_MAX_CHUNK_FACTOR = 4
+_CUT_BEFORE = frozenset(string.ascii_letters + string.digits + "!?;:),]}")
+_CUT_AFTER = frozenset(string.ascii_letters + string.digits)
+
+
+def _iter_lines(source: Union[str, Iterable[str]]) -> Iterator[str]:
+    """
+    Yield the lines of a text or of an iterable of text pieces (file object, generator),
+    each with its newline. Only "\n" ends a line, like the MULTILINE patterns.
+    """
+    if isinstance(source, str):
+        source = io.StringIO(source, newline="\n")
+    partial = ""
+    for piece in source:
+        if "\n" not in piece:
+            partial += piece
+            continue
+        lines = (partial + piece).split("\n")
+        partial = lines.pop()
+        for line in lines:
+            yield line + "\n"
+    if partial:
+        yield partial
+
+
+# Stems and lemmas are memoised per process: every CV and JD shares most of its
+# vocabulary, so after the first few documents these steps are cache lookups.
+# Both caches are bounded and evict the least recently used tokens.
+TOKEN_CACHE_SIZE = 65536
+_PORTER_STEMMER = PorterStemmer()
+_LEMMATIZER = WordNetLemmatizer()
+
+
+@lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def _stem(token: str) -> str:
+    return _PORTER_STEMMER.stem(token)
+
+
+@lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def _lemmatize(token: str) -> str:
+    return _LEMMATIZER.lemmatize(token)
+
+
+# NLTK corpora and inflect are loaded on first use, once per process, so building
+# a Cleaning instance costs nothing and never touches the network.
+@lru_cache(maxsize=None)
+def _stop_words() -> frozenset:
+    NltkResources.require("stopwords")
+    return frozenset(stopwords.words('english'))
+
+
+@lru_cache(maxsize=None)
+def _inflector():
+    # Importing inflect alone takes seconds, so it is deferred as well
+    import inflect
+    return inflect.engine()
+
+
+def _cache_stats(cached) -> dict:
+    info = cached.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "hit_rate": info.hits / lookups if lookups else 0.0,
+        "entries": info.currsize,
+        "max_entries": info.maxsize
+    }
+
+
+def _nltk_resources_for(steps: tuple) -> list:
+    """
+    NLTK resources needed by the given cleaning steps.
+    """
+    names = []
+    if any(step in TOKEN_STEPS for step in steps):
+        names.append("punkt")
+    if "stopwords" in steps:
+        names.append("stopwords")
+    if "lemmatize" in steps:
+        names.append("wordnet")
+    return names
+
+
+# Per-process state of run_many() workers, set up once by _init_cleaning_worker
+_worker_cleaning = None
+
+
+def _init_cleaning_worker(nltk_data_dir: Optional[Path], vocabulary_path: Optional[Path], steps: tuple) -> None:
+    """
+    Process pool initializer: create the worker's Cleaning instance and load the
+    NLTK resources needed by the given steps once, so every document after that
+    only pays for the cleaning itself.
+    """
+    global _worker_cleaning
+    _worker_cleaning = Cleaning(vocabulary_path=vocabulary_path, nltk_data_dir=nltk_data_dir)
+    for name in _nltk_resources_for(steps):
+        NltkResources.require(name)
+    if "stopwords" in steps:
+        _stop_words()
+    if "lemmatize" in steps:
+        _LEMMATIZER.lemmatize("warmup")
+    if "numbers_to_words" in steps:
+        _inflector()
+
+
+def _clean_in_worker(steps: tuple, content: str) -> str:
+    """
+    Run the given cleaning steps on one document inside a worker process.
+    """
+    return _worker_cleaning.run(content, profile=steps)
+
+
 class Cleaning:
     """
     Main Exposed Function for Cleaning
     Is : run(self , cv_content : str) -> str 
     """
-    def __init__(self):
+    def __init__(
+        self,
+        vocabulary_path: Union[str, Path, None] = None,
+        nltk_data_dir: Union[str, Path, None] = None,
+        language_detector: Optional[LanguageDetector] = None
+    ):
+        """
+        Args:
+            vocabulary_path (str | Path | None): Optional word list (whitespace separated) used to pre-warm the stem/lemma caches
+            nltk_data_dir (str | Path | None): Local NLTK data directory, defaults to the NLTK_DATA environment variable.
+                Resources are never downloaded, see NltkResources
+            language_detector (LanguageDetector | None): When given, the translation callback is skipped for
+                texts already confidently in the target language and short enough
+        """
         self.logger = LoggerSetup.get_logger(__name__)
         self.logger.info("Cleaning instance initialized")
-        self.inflector = inflect.engine()
-        nltk.download('punkt')
-        nltk.download('stopwords')
-        nltk.download('wordnet')
-        self.stop_words = set(stopwords.words('english'))
-        self.porter_stemmer = PorterStemmer()
-        self.lemmatizer = WordNetLemmatizer()
+        self.nltk_data_dir = NltkResources.configure(nltk_data_dir)
+        self.vocabulary_path = vocabulary_path
+        self.cleaning_errors = []
+        self.language_detector = language_detector
+        self.translation_stats = {"checked": 0, "skipped": 0, "translated": 0}
+        self._stats_lock = threading.Lock()
+        self._local = threading.local()
+        self.porter_stemmer = _PORTER_STEMMER
+        self.lemmatizer = _LEMMATIZER
+        if vocabulary_path is not None:
+            self.warm_token_cache(vocabulary_path)
+
+    def warm_token_cache(self, vocabulary_path: Union[str, Path]) -> int:
+        """
+        Pre-compute stems and lemmas for a vocabulary file so the first documents hit the caches
+        Is : warm_token_cache(self, vocabulary_path) -> int
+        Args:
+            vocabulary_path (str | Path): Text file with whitespace separated words
+        Returns:
+            int: Number of distinct words warmed
+        """
+        try:
+            NltkResources.require("wordnet")
+            words = set()
+            with open(vocabulary_path, encoding="utf-8") as vocabulary:
+                for line in vocabulary:
+                    words.update(line.lower().split())
+            for word in words:
+                # Lemmatisation runs on the stemmed token in run()
+                _lemmatize(_stem(word))
+            self.logger.info(f"Token caches warmed with {len(words)} words from {vocabulary_path}")
+            return len(words)
+        except Exception as e:
+            self.logger.error(f"Error warming token caches from {vocabulary_path}: {str(e)}", exc_info=True)
+            raise
+
+    @property
+    def stop_words(self) -> frozenset:
+        """English stopwords, loaded from the local NLTK data on first use."""
+        return _stop_words()
+
+    @property
+    def inflector(self):
+        """Shared inflect engine, created on first use."""
+        return _inflector()
+
+    @staticmethod
+    def token_cache_stats() -> dict:
+        """
+        Return hit/miss counters and sizes of the process-wide stem and lemma caches.
+        """
+        return {"stem": _cache_stats(_stem), "lemma": _cache_stats(_lemmatize)}
 
     def __remove_special_characters(self , content : str) -> str:
         """
@@ -30,17 +264,14 @@ class Cleaning:
         """
         try:
             # Remove non-printable characters except newlines, tabs, and carriage returns
-            content = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]', '', content)
+            content = _NON_PRINTABLE.sub('', content)
             
-            # Remove excessive special characters (keeping common punctuation)
+            # Replace excessive special characters and list markers with a space (keeping common punctuation)
             # This preserves: letters, numbers, spaces, newlines, basic punctuation (.,;:!?-()[]{}@#$%&*+=/)
-            content = re.sub(r'[^\w\s.,;:!?\-()\[\]{}@#$%&*+=/\n\r\t\'"°•·]', ' ', content)
-            
-            # Remove bullet points and special list markers
-            content = re.sub(r'[►▪▫■□●○◆◇★☆✓✔✗✘➢➣➤]', '', content)
+            content = _UNWANTED_CHARACTERS.sub(' ', content)
             
             # Remove multiple consecutive special characters (except spaces and newlines)
-            content = re.sub(r'([.,;:!?\-]){2,}', r'\1', content)
+            content = _REPEATED_PUNCTUATION.sub(r'\1', content)
             
             self.logger.debug(f"Special characters removed. Length after: {len(content)}")
             return content
@@ -59,19 +290,17 @@ class Cleaning:
             content = content.replace('\t', ' ')
             
             # Replace multiple spaces with single space
-            content = re.sub(r' {2,}', ' ', content)
+            if '  ' in content:
+                content = _REPEATED_SPACES.sub(' ', content)
             
-            # Remove spaces at the beginning of lines
-            content = re.sub(r'^[ ]+', '', content, flags=re.MULTILINE)
-            
-            # Remove spaces at the end of lines
-            content = re.sub(r'[ ]+$', '', content, flags=re.MULTILINE)
+            # Remove spaces at the beginning and end of lines
+            content = _LINE_EDGE_SPACES.sub('', content)
             
             # Remove space before punctuation
-            content = re.sub(r'\s+([.,;:!?)])', r'\1', content)
+            content = _SPACE_BEFORE_PUNCTUATION.sub(r'\1', content)
             
             # Ensure space after punctuation (if not already present)
-            content = re.sub(r'([.,;:!?])([^\s\d])', r'\1 \2', content)
+            content = _MISSING_SPACE_AFTER_PUNCTUATION.sub(r'\1 \2', content)
             
             self.logger.debug(f"Extra spaces removed. Length after: {len(content)}")
             return content
@@ -90,11 +319,12 @@ class Cleaning:
             content = content.replace('\r\n', '\n').replace('\r', '\n')
             
             # Remove more than 2 consecutive newlines (keep max 1 blank line between sections)
-            content = re.sub(r'\n{3,}', '\n\n', content)
+            if '\n\n\n' in content:
+                content = _EXCESS_NEWLINES.sub('\n\n', content)
             
             # Remove newlines that appear after certain punctuation followed by space
             # This helps merge lines that were incorrectly split
-            content = re.sub(r'([a-z,])\n([a-z])', r'\1 \2', content)
+            content = _BROKEN_LINE.sub(r'\1 \2', content)
             
             # Remove leading and trailing newlines from the entire content
             content = content.strip()
@@ -112,13 +342,17 @@ class Cleaning:
         Is : __remove_headers_footers(self, content: str, header_patterns=None, footer_patterns=None) -> str
         """
         try:
-            if header_patterns is None:
-                header_patterns = [r'^.*Header.*$']
-            if footer_patterns is None:
-                footer_patterns = [r'^.*Footer.*$']
+            if header_patterns is None and footer_patterns is None:
+                if 'Header' in content or 'Footer' in content:
+                    content = _DEFAULT_HEADERS_FOOTERS.sub('', content)
+            else:
+                if header_patterns is None:
+                    header_patterns = _DEFAULT_HEADER_PATTERNS
+                if footer_patterns is None:
+                    footer_patterns = _DEFAULT_FOOTER_PATTERNS
 
-            for pattern in header_patterns + footer_patterns:
-                content = re.sub(pattern, '', content, flags=re.MULTILINE)
+                for pattern in header_patterns + footer_patterns:
+                    content = re.sub(pattern, '', content, flags=re.MULTILINE)
 
             self.logger.debug(f"Headers and footers removed. Length after: {len(content)}")
             return content.strip()
@@ -126,7 +360,7 @@ class Cleaning:
             self.logger.error(f"Error removing headers/footers: {str(e)}", exc_info=True)
             raise
 
-    def __remove_repeated_substrings(self, content: str, pattern=r'\.{2,}') -> str:
+    def __remove_repeated_substrings(self, content: str, pattern=_DEFAULT_REPEATED_PATTERN) -> str:
         """
         Private Function for Removing Repeated Substrings
         Removes repeated patterns like multiple dots, dashes, etc.
@@ -134,16 +368,18 @@ class Cleaning:
         """
         try:
             # Remove repeated dots
-            content = re.sub(pattern, '.', content)
-            
-            # Remove repeated dashes
-            content = re.sub(r'-{3,}', '-', content)
+            if pattern != _DEFAULT_REPEATED_PATTERN:
+                content = re.sub(pattern, '.', content)
+            elif '..' in content:
+                content = _REPEATED_DOTS.sub('.', content)
             
-            # Remove repeated underscores
-            content = re.sub(r'_{3,}', '_', content)
+            # Remove repeated dashes and underscores
+            if '---' in content or '___' in content:
+                content = _REPEATED_DASHES_UNDERSCORES.sub(r'\1', content)
             
             # Remove repeated equals signs
-            content = re.sub(r'={3,}', '', content)
+            if '===' in content:
+                content = _REPEATED_EQUALS.sub('', content)
             
             self.logger.debug(f"Repeated substrings removed. Length after: {len(content)}")
             return content.strip()
@@ -172,75 +408,90 @@ class Cleaning:
         Is : __convert_numbers_to_words(self , content : str) -> str 
         """
         try:
+            inflector = self.inflector
+
             def replace_number(match):
                 number = match.group(0)
-                return self.inflector.number_to_words(number)
+                return inflector.number_to_words(number)
 
-            content = re.sub(r'\b\d+\b', replace_number, content)
+            content = _NUMBER.sub(replace_number, content)
             self.logger.debug(f"Numbers converted to words. Length after: {len(content)}")
             return content
         except Exception as e:
             self.logger.error(f"Error converting numbers to words: {str(e)}", exc_info=True)
             raise   
 
-    def  __remove_stopwords(self , content : str) -> str:
+    def __tokenize(self , content : str) -> list:
+        """
+        Private Function for Tokenizing Text
+        Splits the text into the token list shared by all token level steps
+        Is : __tokenize(self , content : str) -> list 
+        """
+        try:
+            NltkResources.require("punkt")
+            tokens = word_tokenize(content)
+            self.logger.debug(f"Text tokenized. Tokens: {len(tokens)}")
+            return tokens
+        except Exception as e:
+            self.logger.error(f"Error tokenizing text: {str(e)}", exc_info=True)
+            raise
+
+    def  __remove_stopwords(self , tokens : list) -> list:
         """
         Private Function for Removing Stopwords
-        Removes common stopwords from the text
-        Is : __remove_stopwords(self , content : str) -> str 
+        Removes common stopwords from the token list
+        Is : __remove_stopwords(self , tokens : list) -> list 
         """
         try:
-            words = word_tokenize(content)
-            filtered_words = [word for word in words if word.lower() not in self.stop_words]
-            content = ' '.join(filtered_words)
-            self.logger.debug(f"Stopwords removed. Length after: {len(content)}")
-            return content
+            stop_words = self.stop_words
+            tokens = [word for word in tokens if word.lower() not in stop_words]
+            self.logger.debug(f"Stopwords removed. Tokens after: {len(tokens)}")
+            return tokens
         except Exception as e:
             self.logger.error(f"Error removing stopwords: {str(e)}", exc_info=True)
             raise     
 
-    def __stem_words(self , content : str) -> str:
+    def __stem_words(self , tokens : list) -> list:
         """
         Private Function for Stemming Words
-        Reduces words to their root form using Porter Stemmer
-        Is : __stem_words(self , content : str) -> str 
+        Reduces words to their root form using the memoised Porter Stemmer
+        Is : __stem_words(self , tokens : list) -> list 
         """
         try:
-            words = word_tokenize(content)
-            stemmed_words = [self.porter_stemmer.stem(word) for word in words]
-            content = ' '.join(stemmed_words)
-            self.logger.debug(f"Words stemmed. Length after: {len(content)}")
-            return content
+            tokens = [_stem(word) for word in tokens]
+            self.logger.debug(f"Words stemmed. Tokens after: {len(tokens)}")
+            return tokens
         except Exception as e:
             self.logger.error(f"Error stemming words: {str(e)}", exc_info=True)
             raise        
 
-    def __lemmatize_words(self , content : str) -> str: 
+    def __lemmatize_words(self , tokens : list) -> list: 
         """
         Private Function for Lemmatizing Words
-        Reduces words to their base form using WordNet Lemmatizer
-        Is : __lemmatize_words(self , content : str) -> str 
+        Reduces words to their base form using the memoised WordNet Lemmatizer
+        Is : __lemmatize_words(self , tokens : list) -> list 
         """
         try:
-            words = word_tokenize(content)
-            lemmatized_words = [self.lemmatizer.lemmatize(word) for word in words]
-            content = ' '.join(lemmatized_words)
-            self.logger.debug(f"Words lemmatized. Length after: {len(content)}")
-            return content
+            NltkResources.require("wordnet")
+            tokens = [_lemmatize(word) for word in tokens]
+            self.logger.debug(f"Words lemmatized. Tokens after: {len(tokens)}")
+            return tokens
         except Exception as e:
             self.logger.error(f"Error lemmatizing words: {str(e)}", exc_info=True)
             raise   
-    def __remove_repetitive_words(self , content : str) -> str:
+    def __remove_repetitive_words(self , tokens : list , seen_words : Optional[set] = None) -> list:
         """
         Private Function for Removing Repetitive Words from Text
-        Removes ALL duplicate words from entire text, keeping only first occurrence
-        Is : __remove_repetitive_words(self , content : str) -> str 
+        Removes ALL duplicate words from the token list, keeping only first occurrence
+        Is : __remove_repetitive_words(self , tokens : list , seen_words=None) -> list 
+        Args:
+            seen_words: Optional set of lowercased words already emitted (updated in place),
+                carries the de-duplication state across the chunks of run_stream()
         """
         try:
-            tokens = word_tokenize(content)
-            
             # Remove all duplicate words while preserving order of first occurrences
-            seen_words = set()
+            if seen_words is None:
+                seen_words = set()
             filtered_tokens = []
             
             for token in tokens:
@@ -250,70 +501,507 @@ class Cleaning:
                     filtered_tokens.append(token)
                     seen_words.add(token_lower)
             
-            content = ' '.join(filtered_tokens)
-            self.logger.debug(f"Repetitive words removed. Length after: {len(content)}")
-            return content
+            self.logger.debug(f"Repetitive words removed. Tokens after: {len(filtered_tokens)}")
+            return filtered_tokens
         except Exception as e:
             self.logger.error(f"Error removing repetitive words: {str(e)}", exc_info=True)
             raise
-    def run(self , content : str , translation_callback=None) -> str:
+    def __text_steps(self) -> dict:
+        """
+        Private Function mapping text step names to their implementation
+        Is : __text_steps(self) -> dict
+        """
+        return {
+            "headers_footers": self.__remove_headers_footers,
+            "special_characters": self.__remove_special_characters,
+            "repeated_substrings": self.__remove_repeated_substrings,
+            "extra_spaces": self.__remove_extra_spaces,
+            "extra_newlines": self.__remove_extra_newlines,
+            "lowercase": self.__text_lowercase,
+            "numbers_to_words": self.__convert_numbers_to_words,
+        }
+
+    def normalise(self, content: str) -> str:
+        """
+        Apply the normalisation steps (NORMALISATION_STEPS) only, without the timings of run()
+        Is : normalise(self, content: str) -> str
+        """
+        steps = self.__text_steps()
+        for name in NORMALISATION_STEPS:
+            content = steps[name](content)
+        return content
+
+    def __token_steps(self) -> dict:
+        """
+        Private Function mapping token step names to their implementation
+        Is : __token_steps(self) -> dict
+        """
+        return {
+            "stopwords": self.__remove_stopwords,
+            "stem": self.__stem_words,
+            "lemmatize": self.__lemmatize_words,
+            "dedupe": self.__remove_repetitive_words,
+        }
+
+    def resolve_profile(self, profile: Union[str, Sequence[str]]) -> tuple:
+        """
+        Return the ordered step names of a profile
+        Is : resolve_profile(self, profile) -> tuple
+        Args:
+            profile: Name in CLEANING_PROFILES, or an explicit sequence of step names
+        Raises:
+            ValueError: On an unknown profile or step name
+        """
+        if isinstance(profile, str):
+            if profile not in CLEANING_PROFILES:
+                raise ValueError(f"Unknown cleaning profile '{profile}', expected one of {sorted(CLEANING_PROFILES)}")
+            return CLEANING_PROFILES[profile]
+        steps = tuple(profile)
+        known = set(self.__text_steps()) | set(TOKEN_STEPS) | {"translate"}
+        unknown = [step for step in steps if step not in known]
+        if unknown:
+            raise ValueError(f"Unknown cleaning steps {unknown}, expected steps from {sorted(known)}")
+        return steps
+
+    @property
+    def last_timings(self) -> dict:
+        """
+        Duration in seconds of each step of the last run() in the calling thread
+        ("tokenize" included when token steps ran).
+        """
+        return getattr(self._local, "last_timings", {})
+
+    @last_timings.setter
+    def last_timings(self, timings: dict) -> None:
+        self._local.last_timings = timings
+
+    def __run_steps(self, content: str, steps: tuple, translation_callback, timings: dict, seen_words: Optional[set] = None) -> str:
+        """
+        Private Function running cleaning steps in order on one text
+        Step durations are added to timings, seen_words is passed to the de-duplication step
+        Is : __run_steps(self, content, steps, translation_callback, timings, seen_words=None) -> str
+        """
+        text_steps = self.__text_steps()
+        token_steps = self.__token_steps()
+        tokens = None
+        for name in steps:
+            if name == "translate" and translation_callback is None:
+                continue
+            if name in token_steps:
+                # Tokenize once, consecutive token steps map or filter the same list
+                if tokens is None:
+                    start = time.perf_counter()
+                    tokens = self.__tokenize(content)
+                    timings["tokenize"] = timings.get("tokenize", 0.0) + time.perf_counter() - start
+                start = time.perf_counter()
+                if name == "dedupe":
+                    tokens = self.__remove_repetitive_words(tokens, seen_words)
+                else:
+                    tokens = token_steps[name](tokens)
+            else:
+                if tokens is not None:
+                    content = ' '.join(tokens)
+                    tokens = None
+                start = time.perf_counter()
+                content = translation_callback(content) if name == "translate" else text_steps[name](content)
+            elapsed = time.perf_counter() - start
+            timings[name] = timings.get(name, 0.0) + elapsed
+            self.logger.debug(f"Step '{name}' completed in {elapsed * 1000:.1f} ms")
+        
+        if tokens is not None:
+            content = ' '.join(tokens)
+        return content
+
+    def __gate_translation(self, translation_callback, target_language: str, max_untranslated_length: Optional[int]):
+        """
+        Private Function wrapping the translation callback with the language detection gate
+        The callback is skipped when the text is short enough and already in the target language
+        Is : __gate_translation(self, translation_callback, target_language, max_untranslated_length)
+        """
+        if translation_callback is None or self.language_detector is None:
+            return translation_callback
+
+        def gated_translation(content: str) -> str:
+            skip = (max_untranslated_length is None or len(content) <= max_untranslated_length) \
+                and self.language_detector.is_language(content, target_language)
+            with self._stats_lock:
+                self.translation_stats["checked"] += 1
+                self.translation_stats["skipped" if skip else "translated"] += 1
+            if skip:
+                self.logger.info(f"Text already in {target_language} ({len(content)} chars), translation call skipped")
+                return content
+            return translation_callback(content)
+
+        return gated_translation
+
+    def translation_gate_stats(self) -> dict:
+        """
+        Return how many translation calls the language detection gate checked and skipped.
+        """
+        with self._stats_lock:
+            stats = dict(self.translation_stats)
+        stats["skip_rate"] = stats["skipped"] / stats["checked"] if stats["checked"] else 0.0
+        return stats
+
+    def run(
+        self ,
+        content : str ,
+        translation_callback=None ,
+        profile="full" ,
+        target_language : str = "English" ,
+        max_untranslated_length : Optional[int] = None
+    ) -> str:
         """
         Main Exposed Function for Cleaning
-        Is : run(self , content : str , translation_callback=None) -> str 
+        Is : run(self , content : str , translation_callback=None , profile="full" , target_language="English" , max_untranslated_length=None) -> str 
         Args:
             content: The text content to be cleaned
             translation_callback: Optional function to translate text to English
+            profile: Cleaning profile name (see CLEANING_PROFILES) or a sequence of step names
+            target_language: Language the translation callback translates to (checked by the language detector)
+            max_untranslated_length: Longest text that may skip the callback when already in the target language
+                (None: any length)
         """
-        self.logger.info(f"Starting Cleaning process. Content length: {len(content)} characters")
+        steps = self.resolve_profile(profile)
+        translation_callback = self.__gate_translation(translation_callback, target_language, max_untranslated_length)
+        profile_name = profile if isinstance(profile, str) else "custom"
+        self.logger.info(f"Starting Cleaning process ({profile_name} profile). Content length: {len(content)} characters")
         
         try:
-            # Remove headers and footers
-            content = self.__remove_headers_footers(content)
-            self.logger.debug("Headers and footers removed")
-            
-            # Remove special characters
-            content = self.__remove_special_characters(content)
-            self.logger.debug("Special characters removed")
-            
-            # Remove repeated substrings like dots
-            content = self.__remove_repeated_substrings(content)
-            self.logger.debug("Repeated substrings removed")
-            
-            # Remove extra spaces between lines and within lines
-            content = self.__remove_extra_spaces(content)
-            self.logger.debug("Extra spaces removed")
-            
-            # Remove extra newlines
-            content = self.__remove_extra_newlines(content)
-            self.logger.debug("Extra newlines removed")
-            
-            # Convert text to lowercase
-            content = self.__text_lowercase(content)
-            self.logger.debug("Text converted to lowercase")
-            
-            content = translation_callback(content) if translation_callback else content
-            # Convert numbers to words
-            content = self.__convert_numbers_to_words(content)
-            self.logger.debug("Numbers converted to words")
-            
-            # Remove stopwords
-            content = self.__remove_stopwords(content)
-            self.logger.debug("Stopwords removed")
-            
-            # Stem words
-            content = self.__stem_words(content)
-            self.logger.debug("Words stemmed")
-            
-            # Lemmatize words
-            content = self.__lemmatize_words(content)
-            self.logger.debug("Words lemmatized")
-            
-            # Remove repetitive words
-            content = self.__remove_repetitive_words(content)
-            self.logger.debug("Repetitive words removed")
-            
-            self.logger.info(f"Cleaning completed. Final content length: {len(content)} characters")
+            timings = {}
+            content = self.__run_steps(content, steps, translation_callback, timings)
+            self.last_timings = timings
+            timings_ms = {name: round(seconds * 1000, 1) for name, seconds in timings.items()}
+            self.logger.info(f"Cleaning completed. Final content length: {len(content)} characters. Step timings (ms): {timings_ms}")
             return content
         except Exception as e:
             self.logger.error(f"Error during Cleaning: {str(e)}", exc_info=True)
-            raise
\ No newline at end of file
+            raise
+
+    def run_many(
+        self,
+        contents: Iterable[str],
+        translation_callback=None,
+        profile="full",
+        max_workers: Optional[int] = None,
+        ordered: bool = True,
+        target_language: str = "English",
+        max_untranslated_length: Optional[int] = None
+    ) -> Iterator[Tuple[int, str]]:
+        """
+        Batch cleaning: spread documents over a process pool, outside the GIL.
+        Each worker loads its NLTK resources once and keeps them for every document.
+        The translation callback always runs in this process, between the steps before
+        and after "translate", so no LLM client is used from a worker.
+        A failing document does not stop the batch, its error is recorded in self.cleaning_errors.
+        Is : run_many(self , contents , translation_callback=None , profile="full" , max_workers=None , ordered=True , target_language="English" , max_untranslated_length=None) -> Iterator[(index, text)]
+        Args:
+            contents: Iterable of document texts
+            translation_callback: Optional function to translate text to English
+            profile: Cleaning profile name (see CLEANING_PROFILES) or a sequence of step names
+            max_workers (int | None): Number of worker processes (default: CPU count)
+            ordered (bool): Yield results in input order (True) or as soon as they complete (False)
+            target_language: Language the translation callback translates to (checked by the language detector)
+            max_untranslated_length: Longest text that may skip the callback when already in the target language
+        """
+        steps = self.resolve_profile(profile)
+        # Resolve the NLTK data here first: a missing resource raises its LookupError
+        # (with the install command) instead of breaking the pool in the worker initializer
+        for name in _nltk_resources_for(steps):
+            NltkResources.require(name)
+        translation_callback = self.__gate_translation(translation_callback, target_language, max_untranslated_length)
+        if translation_callback is not None and "translate" in steps:
+            cut = steps.index("translate")
+            before, after = steps[:cut], steps[cut + 1:]
+        else:
+            before, after = steps, None
+        workers = max_workers or os.cpu_count() or 1
+        self.logger.info(f"Starting batch Cleaning with steps {list(steps)} across {workers} worker processes")
+        self.cleaning_errors = []
+        results = {}
+        next_index = 0
+        cleaned = 0
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_cleaning_worker,
+            initargs=(self.nltk_data_dir, self.vocabulary_path, steps)
+        ) as executor:
+            pending = {}
+            documents = enumerate(contents)
+            exhausted = False
+            while pending or not exhausted:
+                # Only keep a bounded number of documents in flight (or waiting for their
+                # turn in ordered mode) so huge batches stream
+                while not exhausted and len(pending) + len(results) < workers * 2:
+                    try:
+                        index, content = next(documents)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    pending[executor.submit(_clean_in_worker, before, content)] = (index, True)
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, first_pass = pending.pop(future)
+                    try:
+                        text = future.result()
+                        if first_pass and after is not None:
+                            text = translation_callback(text)
+                            if after:
+                                pending[executor.submit(_clean_in_worker, after, text)] = (index, False)
+                                continue
+                    except Exception as e:
+                        self.logger.error(f"Failed to clean document {index}: {str(e)}")
+                        self.cleaning_errors.append({"index": index, "error": str(e)})
+                        text = None
+
+                    if not ordered:
+                        if text is not None:
+                            cleaned += 1
+                            yield index, text
+                        continue
+                    results[index] = text
+                    while next_index in results:
+                        text = results.pop(next_index)
+                        if text is not None:
+                            cleaned += 1
+                            yield next_index, text
+                        next_index += 1
+
+        self.logger.info(f"Batch Cleaning completed: {cleaned} documents cleaned, {len(self.cleaning_errors)} failed")
+
+    def run_stream(
+        self,
+        source: Union[str, Iterable[str]],
+        profile="full",
+        chunk_chars: int = STREAM_CHUNK_CHARS
+    ) -> Iterator[str]:
+        """
+        Streaming Cleaning for very large documents, in bounded memory.
+        The input is read line by line and cleaned in line aligned chunks of about chunk_chars
+        characters. Chunks are only cut where no cleaning rule spans the cut, the whitespace at
+        the cut is cleaned separately and the de-duplication state is carried from one chunk to
+        the next, so joining the yielded pieces gives the same text as run(). A text without any
+        safe cut is still cut at STREAM_MAX_CHUNK_FACTOR * chunk_chars, where the output may
+        differ slightly. The translate step needs the whole document and is not run here.
+        Is : run_stream(self , source , profile="full" , chunk_chars=STREAM_CHUNK_CHARS) -> Iterator[str]
+        Args:
+            source: Text, or iterable of text pieces such as an open text file
+            profile: Cleaning profile name (see CLEANING_PROFILES) or a sequence of step names
+            chunk_chars (int): Target number of characters per chunk
+        """
+        steps = tuple(step for step in self.resolve_profile(profile) if step != "translate")
+        first_token_step = next((i for i, step in enumerate(steps) if step in TOKEN_STEPS), len(steps))
+        # Steps after the first token step only see a single space separated line
+        token_output = first_token_step < len(steps)
+        boundary_steps = steps[:first_token_step]
+        # Cross-line merges only see lowercase letters, unless the text was lowercased first
+        merge_letters = string.ascii_lowercase
+        if "lowercase" in steps and "extra_newlines" in steps and steps.index("lowercase") < steps.index("extra_newlines"):
+            merge_letters = string.ascii_letters
+        cut_before = _CUT_BEFORE if token_output else _CUT_BEFORE | {"."}
+        profile_name = profile if isinstance(profile, str) else "custom"
+        self.logger.info(f"Starting streaming Cleaning ({profile_name} profile) with {chunk_chars} character chunks")
+        timings = {}
+        seen_words = set()
+        gaps = {}
+        state = {"separator": None, "emitted": False, "chunks": 0}
+
+        def clean_gap(gap: str) -> Optional[str]:
+            # The gap between two characters that no rule touches, cleaned like in the whole text
+            if gap not in gaps:
+                cleaned = self.__run_steps("!" + gap + "Z", boundary_steps, None, {})
+                gaps[gap] = cleaned[1:-1] if cleaned[:1] == "!" and cleaned[-1:] in ("Z", "z") else None
+            return gaps[gap]
+
+        def gap_between(chunk: list, before: int, after: int) -> str:
+            # Whitespace between the content lines chunk[before] and chunk[after]
+            head, tail = chunk[before], chunk[after]
+            return head[len(head.rstrip()):] + "".join(chunk[before + 1:after]) + tail[:len(tail) - len(tail.lstrip())]
+
+        def cut_separator(chunk: list, before: int, after: int) -> Optional[str]:
+            # Text joining the two sides of a cut between content lines, None when the cut is unsafe
+            last, first = chunk[before].rstrip()[-1:], chunk[after].lstrip()[:1]
+            if last not in cut_before or first not in _CUT_AFTER:
+                return None
+            if any(marker in chunk[index] for marker in ("Header", "Footer") for index in (before, after)):
+                return None
+            gap = clean_gap(gap_between(chunk, before, after))
+            if gap is None:
+                return None
+            # ([a-z,])\n([a-z]) merges lines separated by a single newline
+            if gap.count("\n") < 2 and (last in merge_letters or last == ",") and first in merge_letters:
+                return None
+            return " " if token_output else gap
+
+        def clean(lines: list) -> Iterator[str]:
+            cleaned = self.__run_steps("".join(lines), steps, None, timings, seen_words)
+            state["chunks"] += 1
+            if cleaned:
+                yield cleaned if state["separator"] is None else state["separator"] + cleaned
+                state["emitted"] = True
+
+        try:
+            chunk = []
+            size = 0
+            # Indexes of the last two content (non blank) lines of the chunk
+            previous_content = last_content = None
+            for line in _iter_lines(source):
+                chunk.append(line)
+                size += len(line)
+                if not line.strip():
+                    continue
+                previous_content, last_content = last_content, len(chunk) - 1
+                # Cut at the first safe place once the chunk is large enough
+                if size < chunk_chars or previous_content is None:
+                    continue
+                separator = cut_separator(chunk, previous_content, last_content)
+                if separator is None:
+                    if size < chunk_chars * STREAM_MAX_CHUNK_FACTOR:
+                        continue
+                    self.logger.warning(f"No safe cut in {size} characters, cutting the stream between two lines")
+                    gap = clean_gap(gap_between(chunk, previous_content, last_content))
+                    separator = " " if token_output else "\n" if gap is None else gap
+
+                yield from clean(chunk[:previous_content] + [chunk[previous_content].rstrip()])
+                if state["emitted"]:
+                    state["separator"] = separator
+                chunk = [line.lstrip()]
+                size = len(chunk[0])
+                previous_content, last_content = None, 0
+            if chunk:
+                yield from clean(chunk)
+
+            self.last_timings = timings
+            timings_ms = {name: round(seconds * 1000, 1) for name, seconds in timings.items()}
+            self.logger.info(f"Streaming Cleaning completed in {state['chunks']} chunks. Step timings (ms): {timings_ms}")
+        except Exception as e:
+            self.logger.error(f"Error during streaming Cleaning: {str(e)}", exc_info=True)
+            raise
+
+# Sample CVs for the golden check: real layout artefacts (PDF headers/footers, bullets,
+# dot leaders, rules, tabs, CRLF, control characters, accents)
+GOLDEN_SAMPLES = (
+    """Page Header - Curriculum Vitae\r\nJANE DOE\tSenior Data Engineer\r\nParis, France | +33 6 12 34 56 78 | jane.doe@mail.fr\r\n\r\n\r\n\r\n"""
+    """PROFILE\r\nData engineer with 7 years of experience ,building pipelines..... on AWS and GCP!!\r\n"""
+    """EXPERIENCE\r\n► Lead Data Engineer @ Octo (2021 – today)\r\n  ▪ Designed a streaming platform (Kafka, Flink)  processing 2M events/s\r\n"""
+    """  ▪ Cut cloud costs by 35%;reduced latency\r\n● Data Engineer — BNP Paribas (2017-2021)\r\n    ✓ Spark , Airflow , dbt\r\n"""
+    """=====================\r\nEDUCATION\r\nMSc Computer Science – Université Paris-Saclay..........2017\r\n"""
+    """_____________________\r\nSKILLS: Python,SQL,Scala ; Terraform\x07\x1b\r\nFooter: page 1/2\r\n""",
+
+    """John Smith\nSoftware Engineer\n\n\n\n\nSUMMARY\nbackend engineer focused on\ndistributed systems,\nobservability and\ntesting.\n"""
+    """------------------------------------\nEXPERIENCE\n* Senior Engineer at Acme Corp.(2019 - 2024)\n"""
+    """    - Migrated 40+ services to Kubernetes...\n    - Mentored 5 engineers!!!\n\n\n"""
+    """* Engineer at Initech (2015 - 2019)\n\t- Java 8 → 17 upgrade ; Spring Boot\n"""
+    """CERTIFICATIONS\n★ AWS Solutions Architect – Associate\n☆ CKA\n\n"""
+    """Header text that repeats on every page\nPROJECTS\n◆ ledger-lite: double entry bookkeeping in Go ??\n◇ tinyq : a job queue,in Rust\n""",
+
+    """CURRICULUM VITAE — Ibrahim Goumrane\n\n\nTECHNICAL SKILLS\n\n\nBackend & Core: Java, Spring Boot, Python, SQL, RESTful APIs.\n"""
+    """Data & Databases: MySQL, PostgreSQL , MongoDB , Redis .\n\n\n\nDevOps & Cloud: Docker, AWS (Academy Graduate), GCP (Digital Leader).\n"""
+    """PROFESSIONAL EXPERIENCE\nFull Stack Developer & Project Lead | EHC Remote | 01/06/2025 – 01/11/2025 \n"""
+    """Developed a robust recruitment platform solution using Spring Boot and React.js.\n"""
+    """Managed the deployment of backend services on VPS environments . . .\n"""
+    """EDUCATION\nDiplôme d'Ingénieur in AI & Software Engineering, ENSAM Casablanca | 2021 – 2026 \n"""
+    """CERTIFICATIONS\n\n\nAWS Academy Graduate - Cloud Foundations \nGCP Digital Leader \n---\nAgile Development & Scrum - IBM\n""",
+)
+
+
+def _reference_normalisation(content: str) -> str:
+    """
+    The normalisation chain as it was before the engine was compiled and fused:
+    one uncompiled re.sub per rule, applied in the order of NORMALISATION_STEPS.
+    Kept as the golden reference of check_normalisation_golden and benchmark_normalisation.
+    """
+    # headers_footers
+    for pattern in [r'^.*Header.*$'] + [r'^.*Footer.*$']:
+        content = re.sub(pattern, '', content, flags=re.MULTILINE)
+    content = content.strip()
+    # special_characters
+    content = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]', '', content)
+    content = re.sub(r'[^\w\s.,;:!?\-()\[\]{}@#$%&*+=/\n\r\t\'"°•·]', ' ', content)
+    content = re.sub(r'[►▪▫■□●○◆◇★☆✓✔✗✘➢➣➤]', '', content)
+    content = re.sub(r'([.,;:!?\-]){2,}', r'\1', content)
+    # repeated_substrings
+    content = re.sub(r'\.{2,}', '.', content)
+    content = re.sub(r'-{3,}', '-', content)
+    content = re.sub(r'_{3,}', '_', content)
+    content = re.sub(r'={3,}', '', content)
+    content = content.strip()
+    # extra_spaces
+    content = content.replace('\t', ' ')
+    content = re.sub(r' {2,}', ' ', content)
+    content = re.sub(r'^[ ]+', '', content, flags=re.MULTILINE)
+    content = re.sub(r'[ ]+$', '', content, flags=re.MULTILINE)
+    content = re.sub(r'\s+([.,;:!?)])', r'\1', content)
+    content = re.sub(r'([.,;:!?])([^\s\d])', r'\1 \2', content)
+    # extra_newlines
+    content = content.replace('\r\n', '\n').replace('\r', '\n')
+    content = re.sub(r'\n{3,}', '\n\n', content)
+    content = re.sub(r'([a-z,])\n([a-z])', r'\1 \2', content)
+    return content.strip()
+
+
+def check_normalisation_golden(samples: Iterable[str] = GOLDEN_SAMPLES, cleaning: Optional[Cleaning] = None) -> list:
+    """
+    Golden check of the normalisation engine: every sample must come out byte-identical
+    from the reference chain, Cleaning.normalise and Cleaning.run(profile=NORMALISATION_STEPS).
+
+    Returns:
+        list: Indexes of the samples whose outputs differ (empty when the check passes)
+    """
+    cleaning = cleaning or Cleaning()
+    mismatches = []
+    for index, sample in enumerate(samples):
+        expected = _reference_normalisation(sample)
+        if cleaning.normalise(sample) != expected or cleaning.run(sample, profile=NORMALISATION_STEPS) != expected:
+            mismatches.append(index)
+    return mismatches
+
+
+def benchmark_normalisation(sizes: Sequence[int] = (10_000, 100_000, 1_000_000), repeats: int = 3,
+                            samples: Sequence[str] = GOLDEN_SAMPLES) -> list:
+    """
+    Compare the reference chain with the compiled engine on inputs of the given sizes
+    (built by repeating the samples).
+
+    Returns:
+        list: One dict per size with the best time of each implementation, the speedup
+        and whether both outputs are byte-identical
+    """
+    cleaning = Cleaning()
+    base = "\n\n".join(samples)
+    results = []
+    for size in sizes:
+        content = (base * (size // len(base) + 1))[:size]
+        timings = {}
+        outputs = {}
+        for name, normalise in (
+            ("reference", _reference_normalisation),
+            ("compiled", cleaning.normalise)
+        ):
+            best = float("inf")
+            for _ in range(repeats):
+                start = time.perf_counter()
+                outputs[name] = normalise(content)
+                best = min(best, time.perf_counter() - start)
+            timings[name] = best
+        results.append({
+            "size": size,
+            "reference_ms": round(timings["reference"] * 1000, 1),
+            "compiled_ms": round(timings["compiled"] * 1000, 1),
+            "speedup": round(timings["reference"] / timings["compiled"], 2),
+            "identical": outputs["reference"] == outputs["compiled"]
+        })
+    return results
+
+
+if __name__ == "__main__":
+    mismatches = check_normalisation_golden()
+    print(f"Golden check: {len(GOLDEN_SAMPLES) - len(mismatches)}/{len(GOLDEN_SAMPLES)} samples byte-identical")
+    for row in benchmark_normalisation():
+        print(row)
+    if mismatches:
+        raise SystemExit(f"Normalisation differs from the reference chain on samples {mismatches}")
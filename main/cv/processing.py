@@ -1,6 +1,7 @@
-from main.processing import BaseProcessing
+from main.processing import BaseProcessing, benchmark_extraction_modes
 from main.cv.cvmodelOutput import CvmodelOutput
-from typing import Any
+from main.section_splitter import CV_HEADINGS
+from typing import Any, Optional
 
 
 class CvProcessing(BaseProcessing):
@@ -33,25 +34,18 @@ class CvProcessing(BaseProcessing):
         """Return the CV output schema."""
         return CvmodelOutput
     
+    def get_sections(self) -> list[str]:
+        """Return the CV sections, in extraction order."""
+        return ["education", "skills", "experience", "certifications", "projects"]
+    
+    def get_section_headings(self) -> dict:
+        """Return the CV heading lexicon."""
+        return CV_HEADINGS
+    
     def get_content_type_name(self) -> str:
         """Return the content type name."""
         return "CV"
     
-    def __extract_education(self, cv_content: str):
-        return self._pass_to_agent(cv_content, "education")
-
-    def __extract_skills(self, cv_content: str):
-        return self._pass_to_agent(cv_content, "skills")
-
-    def __extract_experience(self, cv_content: str):
-        return self._pass_to_agent(cv_content, "experience")
-
-    def __extract_certifications(self, cv_content: str):
-        return self._pass_to_agent(cv_content, "certifications")
-
-    def __extract_projects(self, cv_content: str):
-        return self._pass_to_agent(cv_content, "projects")
-   
     def flatten_objects_to_string(self , objects : dict) -> dict[str , str]:
         # Extract the parts of the cv (objects is a dict, not a Pydantic model)
         education = objects.get("education", [])
@@ -75,13 +69,16 @@ class CvProcessing(BaseProcessing):
             "projects": projects_str
         }
 
-    def run(self, cv_content: str , output_format: str = "json") -> CvmodelOutput:
+    def run(self, cv_content: str , output_format: str = "json", mode: str = "per_section",
+            layout_text: Optional[str] = None) -> CvmodelOutput:
         """
         Process CV content and extract all sections.
         
         Args:
             cv_content: Raw CV text content
             output_format: Format of the output (json or string)
+            mode: Extraction mode, "per_section" or "single" (one call for the sections without a slice, per-section fallback)
+            layout_text: Same document with its line layout kept, to cut the section slices from
             
         Returns:
             CvmodelOutput: Structured CV data
@@ -89,27 +86,7 @@ class CvProcessing(BaseProcessing):
         self.logger.info(f"Starting CV processing. Content length: {len(cv_content)} characters")
         
         try:
-            education = self.__extract_education(cv_content).education
-            self.logger.debug("Education extracted")
-
-            skills = self.__extract_skills(cv_content).skills
-            self.logger.debug("Skills extracted")
-
-            experience = self.__extract_experience(cv_content).experience
-            self.logger.debug("Experience extracted")
-
-            certifications = self.__extract_certifications(cv_content).certifications
-            self.logger.debug("Certifications extracted")
-
-            projects = self.__extract_projects(cv_content).projects
-            self.logger.debug("Projects extracted")
-            result: CvmodelOutput = {
-                    "education": education,
-                    "skills": skills,
-                    "experience": experience,
-                    "certifications": certifications,
-                    "projects": projects
-                }
+            result: CvmodelOutput = self._extract_sections(cv_content, mode=mode, layout_text=layout_text)
             self.logger.info("CV processing completed successfully")
             self.logger.info(f"CV structured: {result}")
             if output_format == "json":
@@ -121,6 +98,34 @@ class CvProcessing(BaseProcessing):
             raise
 
 
+    async def arun(self, cv_content: str, output_format: str = "json", mode: str = "per_section",
+                  layout_text: Optional[str] = None) -> CvmodelOutput:
+        """
+        Async version of run: all section calls are issued at once.
+        
+        Args:
+            cv_content: Raw CV text content
+            output_format: Format of the output (json or string)
+            mode: Extraction mode, "per_section" or "single" (one call for the sections without a slice, per-section fallback)
+            layout_text: Same document with its line layout kept, to cut the section slices from
+            
+        Returns:
+            CvmodelOutput: Structured CV data
+        """
+        self.logger.info(f"Starting async CV processing. Content length: {len(cv_content)} characters")
+        
+        try:
+            result: CvmodelOutput = await self._aextract_sections(cv_content, mode=mode, layout_text=layout_text)
+            self.logger.info("CV processing completed successfully")
+            self.logger.info(f"CV structured: {result}")
+            if output_format == "json":
+                return result
+            elif output_format == "string":
+                return self.flatten_objects_to_string(result)
+        except Exception as e:
+            self.logger.error(f"Error during CV processing: {str(e)}", exc_info=True)
+            raise
+
 if __name__ == "__main__":
     Text_content = """
     GOUMRANE IBRAHIM Software Engineer | Backend Java Specialist Casablanca, Morocco | +212 776 209 303 | ibrahimgoumrane01@gmail.com Portfolio: www.ibrahimgoumrane.dev
@@ -204,6 +209,8 @@ Agile Development & Scrum - IBM
 
     cv_processing = CvProcessing()
     print("Processing CV content...")
+    for row in benchmark_extraction_modes(cv_processing, Text_content):
+        print(row)
     cv_content = cv_processing.run(Text_content)
     print("CV Processing Complete!")
 
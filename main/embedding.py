@@ -1,5 +1,4 @@
-from langchain_ollama import OllamaEmbeddings
-from main import LoggerSetup,CvmodelOutput,DescmodelOutput
+from main import LoggerSetup,LLMRegistry,CvmodelOutput,DescmodelOutput
 import numpy as np
 import time
 
@@ -9,7 +8,7 @@ class Embeddings:
         self.logger = LoggerSetup.get_logger(__name__)
         self.logger.info(f"{self.__class__.__name__} instance initialized")
         try:
-            self.embeddings = OllamaEmbeddings(model="snowflake-arctic-embed2:latest")
+            self.embeddings = LLMRegistry.embeddings("snowflake-arctic-embed2:latest")
             self.logger.info("OllamaEmbeddings model 'snowflake-arctic-embed2:latest' loaded successfully")
         except Exception as e:
             self.logger.error(f"Failed to load OllamaEmbeddings model: {str(e)}", exc_info=True)
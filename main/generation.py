@@ -1,6 +1,6 @@
 from main.utils.logger import LoggerSetup
+from main.utils.llm_registry import LLMRegistry
 from main.generationOutput import EvaluationReport, Decision, OverallScore
-from langchain_ollama import ChatOllama
 import time
 import json
 class Generation:
@@ -152,7 +152,7 @@ class Generation:
 
             # 4. Call LLM (Blindly)
             self.logger.info("Calling LLM for blind qualitative analysis...")
-            llm = ChatOllama(model="llama3:latest", temperature=0.1, format="json")
+            llm = LLMRegistry.chat("llama3:latest", temperature=0.1, format="json")
             
             response = llm.invoke([
                 {"role": "system", "content": system_prompt},
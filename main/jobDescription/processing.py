@@ -1,6 +1,7 @@
 from main.processing import BaseProcessing
 from main.jobDescription.descmodelOutput import DescmodelOutput
-from typing import Any
+from main.section_splitter import JD_HEADINGS
+from typing import Any, Optional
 
 
 class DescProcessing(BaseProcessing):
@@ -32,18 +33,18 @@ class DescProcessing(BaseProcessing):
         """Return the Job Description output schema."""
         return DescmodelOutput
     
+    def get_sections(self) -> list[str]:
+        """Return the Job Description sections, in extraction order."""
+        return ["requirements", "responsibilities", "qualifications"]
+    
+    def get_section_headings(self) -> dict:
+        """Return the Job Description heading lexicon."""
+        return JD_HEADINGS
+    
     def get_content_type_name(self) -> str:
         """Return the content type name."""
         return "Job Description"
     
-    def __extract_requirements(self, jd_content: str):
-        return self._pass_to_agent(jd_content, "requirements")
-
-    def __extract_responsibilities(self, jd_content: str):
-        return self._pass_to_agent(jd_content, "responsibilities")
-
-    def __extract_qualifications(self, jd_content: str):
-        return self._pass_to_agent(jd_content, "qualifications")
     def flatten_objects_to_string(self , objects : dict) -> dict[str , str]:
         # Extract the parts of the job description (objects is a dict, not a Pydantic model)
         requirements = objects.get("requirements", [])
@@ -60,13 +61,16 @@ class DescProcessing(BaseProcessing):
             "responsibilities": responsibilities_str,
             "qualifications": qualifications_str
         }
-    def run(self, jd_content: str, output_format: str = "json") -> DescmodelOutput:
+    def run(self, jd_content: str, output_format: str = "json", mode: str = "per_section",
+            layout_text: Optional[str] = None) -> DescmodelOutput:
         """
         Process Job Description content and extract all sections.
         
         Args:
             jd_content: Raw Job Description text content
             output_format: Format of the output (json or string)
+            mode: Extraction mode, "per_section" or "single" (one call for the sections without a slice, per-section fallback)
+            layout_text: Same document with its line layout kept, to cut the section slices from
             
         Returns:
             DescmodelOutput: Structured Job Description data
@@ -74,20 +78,7 @@ class DescProcessing(BaseProcessing):
         self.logger.info(f"Starting job description processing. Content length: {len(jd_content)} characters")
         
         try:
-            requirements = self.__extract_requirements(jd_content).requirements
-            self.logger.debug("Requirements extracted")
-            
-            responsibilities = self.__extract_responsibilities(jd_content).responsibilities
-            self.logger.debug("Responsibilities extracted")
-            
-            qualifications = self.__extract_qualifications(jd_content).qualifications
-            self.logger.debug("Qualifications extracted")
-            
-            result: DescmodelOutput = {
-                    "requirements": requirements,
-                    "responsibilities": responsibilities,
-                    "qualifications": qualifications
-                }
+            result: DescmodelOutput = self._extract_sections(jd_content, mode=mode, layout_text=layout_text)
             self.logger.info("Job description processing completed successfully")
 
             if output_format == "json":
@@ -99,5 +90,31 @@ class DescProcessing(BaseProcessing):
             self.logger.error(f"Error during job description processing: {str(e)}", exc_info=True)
             raise
 
+    async def arun(self, jd_content: str, output_format: str = "json", mode: str = "per_section",
+                  layout_text: Optional[str] = None) -> DescmodelOutput:
+        """
+        Async version of run: all section calls are issued at once.
+        
+        Args:
+            jd_content: Raw Job Description text content
+            output_format: Format of the output (json or string)
+            mode: Extraction mode, "per_section" or "single" (one call for the sections without a slice, per-section fallback)
+            layout_text: Same document with its line layout kept, to cut the section slices from
+            
+        Returns:
+            DescmodelOutput: Structured Job Description data
+        """
+        self.logger.info(f"Starting async job description processing. Content length: {len(jd_content)} characters")
+        
+        try:
+            result: DescmodelOutput = await self._aextract_sections(jd_content, mode=mode, layout_text=layout_text)
+            self.logger.info("Job description processing completed successfully")
 
-
+            if output_format == "json":
+                return result
+            elif output_format == "string":
+                return self.flatten_objects_to_string(result)
+                        
+        except Exception as e:
+            self.logger.error(f"Error during job description processing: {str(e)}", exc_info=True)
+            raise
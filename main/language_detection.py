@@ -0,0 +1,109 @@
+import re
+import threading
+from collections import Counter
+from typing import Dict, FrozenSet, Optional, Sequence, Tuple
+
+from nltk.corpus import stopwords
+
+from main.utils import LoggerSetup, NltkResources
+
+_WORD = re.compile(r"[^\W\d_]+")
+
+
+class LanguageDetector:
+    """
+    Fast offline language identification from stopword frequencies.
+    Uses the stopword lists of the NLTK stopwords corpus (already a dependency of
+    the cleaning stage), so nothing is downloaded and no model call is made.
+    Main Exposed Functions
+    Is : detect(self, text: str) -> (language, confidence)
+    Is : is_language(self, text: str, language: str) -> bool
+    """
+
+    def __init__(
+        self,
+        languages: Optional[Sequence[str]] = None,
+        sample_chars: int = 20000,
+        min_stopwords: int = 8,
+        min_confidence: float = 0.8
+    ):
+        """
+        Args:
+            languages: NLTK stopword languages to tell apart (default: every language of the corpus)
+            sample_chars (int): Only the first sample_chars characters of a text are looked at
+            min_stopwords (int): Minimum number of stopwords found before a detection is trusted
+            min_confidence (float): Minimum share of the stopwords that must belong to the detected language
+        """
+        self.logger = LoggerSetup.get_logger(__name__)
+        self.languages = tuple(language.lower() for language in languages) if languages else None
+        self.sample_chars = sample_chars
+        self.min_stopwords = min_stopwords
+        self.min_confidence = min_confidence
+        self._index: Optional[Dict[str, FrozenSet[str]]] = None
+        self._lock = threading.Lock()
+        self.logger.info("LanguageDetector initialized")
+
+    def _word_index(self) -> Dict[str, FrozenSet[str]]:
+        """
+        Build (once, on first use) the index from stopword to the languages using it.
+        """
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    NltkResources.require("stopwords")
+                    languages = self.languages or tuple(stopwords.fileids())
+                    index = {}
+                    for language in languages:
+                        for word in stopwords.words(language):
+                            index.setdefault(word, set()).add(language)
+                    self._index = {word: frozenset(owners) for word, owners in index.items()}
+                    self.logger.info(f"Stopword index built for {len(languages)} languages ({len(index)} words)")
+        return self._index
+
+    def detect(self, text: str) -> Tuple[Optional[str], float]:
+        """
+        Identify the language of a text
+        Is : detect(self, text: str) -> (language, confidence)
+
+        Returns:
+            The detected NLTK language name (None when nothing was recognised) and
+            the share of the stopwords found that belong to it (0.0 when the
+            detection is not trusted)
+        """
+        index = self._word_index()
+        counts = Counter()
+        found = 0
+        for word in _WORD.findall(text[:self.sample_chars].lower()):
+            owners = index.get(word)
+            if owners:
+                found += 1
+                counts.update(owners)
+        if not counts:
+            return None, 0.0
+
+        ranked = counts.most_common(2)
+        language, hits = ranked[0]
+        # A tie between two languages (or too little evidence) is not a detection
+        if found < self.min_stopwords or (len(ranked) > 1 and ranked[1][1] == hits):
+            return language, 0.0
+        return language, hits / found
+
+    def is_language(self, text: str, language: str) -> bool:
+        """
+        Return True when the text is confidently written in the given language
+        Is : is_language(self, text: str, language: str) -> bool
+        """
+        detected, confidence = self.detect(text)
+        self.logger.debug(f"Detected language: {detected} (confidence {confidence:.2f})")
+        return detected == language.lower() and confidence >= self.min_confidence
+
+
+if __name__ == "__main__":
+    detector = LanguageDetector()
+    samples = {
+        "english": "He has led multiple teams and delivered over twenty projects in the cloud with his colleagues.",
+        "french": "Il a dirigé plusieurs équipes et livré plus de vingt projets dans le cloud avec ses collègues.",
+        "spanish": "Ha dirigido varios equipos y ha entregado más de veinte proyectos en la nube con sus compañeros.",
+    }
+    for expected, sample in samples.items():
+        print(expected, "->", detector.detect(sample))
@@ -1,7 +1,32 @@
-from main import LoggerSetup
-from langchain_ollama import ChatOllama
+from main import LoggerSetup, LLMRegistry
+from main.section_splitter import SectionSplitter
 from abc import ABC, abstractmethod
-from typing import Any
+from functools import lru_cache
+from pydantic import BaseModel, ValidationError, create_model
+from typing import Any, Optional
+import asyncio
+import json
+import time
+
+# Extraction modes:
+#   per_section: one call per section, bound to the sub-schema of that section
+#   single: one call filling every section without a slice of its own (see main.section_splitter),
+#           then one call per section that has a slice, came back empty or invalid
+EXTRACTION_MODES = ("per_section", "single")
+
+
+@lru_cache(maxsize=None)
+def _section_schema(schema: type[BaseModel], *sections: str) -> type[BaseModel]:
+    """
+    Sub-schema holding only some fields of an output schema, e.g. CvmodelOutputSkills with
+    only skills: List[Skill]. Binding it instead of the full schema keeps the model from
+    generating JSON for the sections that are thrown away.
+    """
+    if set(sections) == set(schema.model_fields):
+        return schema
+    fields = {section: (schema.model_fields[section].annotation, schema.model_fields[section]) for section in sections}
+    name = schema.__name__ + "".join(part.capitalize() for section in sections for part in section.split("_"))
+    return create_model(name, **fields)
 
 
 class BaseProcessing(ABC):
@@ -10,8 +35,15 @@ class BaseProcessing(ABC):
     Provides common extraction logic with customizable admin messages.
     """
     
+    # Model used by every extraction call
+    MODEL = "llama3:latest"
+    
     def __init__(self):
         self.logger = LoggerSetup.get_logger(__name__)
+        headings = self.get_section_headings()
+        self.splitter = SectionSplitter(headings) if headings else None
+        # Calls and tokens of the last extraction
+        self.last_usage = {"calls": 0, "prompt_tokens": 0, "output_tokens": 0}
         self.logger.info(f"{self.__class__.__name__} instance initialized")
     
     @abstractmethod
@@ -39,6 +71,27 @@ class BaseProcessing(ABC):
         """
         pass
     
+    @abstractmethod
+    def get_sections(self) -> list[str]:
+        """
+        Get the names of the sections extracted from the content, in order.
+        Must be implemented by subclasses (one field of the output schema each).
+        
+        Returns:
+            list[str]: Section names
+        """
+        pass
+    
+    def get_section_headings(self) -> Optional[dict]:
+        """
+        Get the heading lexicon used to send each per-section call only its slice of the content.
+        Subclasses may override it (see main.section_splitter); None sends the whole content.
+        
+        Returns:
+            dict | None: Section name -> heading phrases
+        """
+        return None
+    
     @abstractmethod
     def get_content_type_name(self) -> str:
         """
@@ -50,25 +103,17 @@ class BaseProcessing(ABC):
         """
         pass
     
-    def _pass_to_agent(self, content: str, extracted_part: str) -> Any:
+    def _messages(self, content: str, extracted_part: str) -> list:
         """
-        Pass content to LLM agent to extract structured information.
-        Uses llama3:latest model.
+        Build the extraction prompt for one part of the content.
         
         Args:
             content: The content to process
-            extracted_part: The specific part to extract
+            extracted_part: The specific part (or parts) to extract
             
         Returns:
-            Structured output based on the schema
+            list: System and user messages
         """
-        llm = ChatOllama(
-            model="llama3:latest",
-            temperature=0.0,
-            reasoning=False,
-            format="json"
-        ).with_structured_output(schema=self.get_output_schema())
-        
         # Get the customized admin message from the subclass
         admin_message = {
             "role": "system",
@@ -79,9 +124,251 @@ class BaseProcessing(ABC):
             "role": "user",
             "content": f"{self.get_content_type_name()} Content:\n{content}\n\nExtract {extracted_part}."
         }
+        return [admin_message, chat_message]
+    
+    @staticmethod
+    def _parts_phrase(sections: list) -> str:
+        """Name sections in one phrase, e.g. 'requirements, responsibilities and qualifications'"""
+        return ", ".join(sections[:-1]) + " and " + sections[-1] if len(sections) > 1 else sections[0]
+    
+    def _pass_to_agent(self, content: str, extracted_part: str) -> Any:
+        """
+        Pass content to LLM agent to extract structured information.
+        Uses llama3:latest model.
+        
+        Args:
+            content: The content to process
+            extracted_part: The specific part to extract
+            
+        Returns:
+            Structured output based on the section schema (only the extracted_part field)
+        """
+        llm = LLMRegistry.chat(
+            self.MODEL,
+            schema=_section_schema(self.get_output_schema(), extracted_part),
+            include_raw=True,
+            temperature=0.0,
+            reasoning=False,
+            format="json"
+        )
         
-        response = llm.invoke([admin_message, chat_message])
-        return response
+        response = llm.invoke(self._messages(content, extracted_part))
+        return self._parsed(response, extracted_part)
+    
+    async def _apass_to_agent(self, content: str, extracted_part: str) -> Any:
+        """
+        Async version of _pass_to_agent, bounded by the concurrency limit of the model.
+        """
+        llm = LLMRegistry.achat(
+            self.MODEL,
+            schema=_section_schema(self.get_output_schema(), extracted_part),
+            include_raw=True,
+            temperature=0.0,
+            reasoning=False,
+            format="json"
+        )
+        async with LLMRegistry.limit(self.MODEL):
+            response = await llm.ainvoke(self._messages(content, extracted_part))
+        return self._parsed(response, extracted_part)
+    
+    def _pass_all_to_agent(self, content: str, sections: list) -> dict:
+        """
+        Extract several sections in a single LLM call.
+        Sections are validated one by one, so a bad section does not discard the others.
+        
+        Args:
+            content: The content to process
+            sections: The sections to extract
+            
+        Returns:
+            dict: Section name -> validated value, for the sections that came back valid
+        """
+        llm = LLMRegistry.chat(
+            self.MODEL,
+            schema=_section_schema(self.get_output_schema(), *sections),
+            include_raw=True,
+            temperature=0.0,
+            reasoning=False,
+            format="json"
+        )
+        return self._parse_all(llm.invoke(self._messages(content, self._parts_phrase(sections))), sections)
+    
+    async def _apass_all_to_agent(self, content: str, sections: list) -> dict:
+        """
+        Async version of _pass_all_to_agent, bounded by the concurrency limit of the model.
+        """
+        llm = LLMRegistry.achat(
+            self.MODEL,
+            schema=_section_schema(self.get_output_schema(), *sections),
+            include_raw=True,
+            temperature=0.0,
+            reasoning=False,
+            format="json"
+        )
+        async with LLMRegistry.limit(self.MODEL):
+            response = await llm.ainvoke(self._messages(content, self._parts_phrase(sections)))
+        return self._parse_all(response, sections)
+    
+    def _log_usage(self, response: dict, extracted_part: str) -> None:
+        """
+        Private Function for the extraction calls
+        Is : Log the prompt and generated token counts (and decode time) of one call
+        """
+        raw = response["raw"]
+        usage = getattr(raw, "usage_metadata", None)
+        if not usage:
+            return
+        eval_duration = (getattr(raw, "response_metadata", None) or {}).get("eval_duration")
+        decode = f", decode {eval_duration / 1e9:.2f}s" if eval_duration else ""
+        self.last_usage["calls"] += 1
+        self.last_usage["prompt_tokens"] += usage["input_tokens"]
+        self.last_usage["output_tokens"] += usage["output_tokens"]
+        self.logger.info(
+            f"{self.get_content_type_name()} {extracted_part}: "
+            f"{usage['input_tokens']} prompt tokens, {usage['output_tokens']} output tokens{decode}"
+        )
+    
+    def _parsed(self, response: dict, extracted_part: str) -> Any:
+        """
+        Private Function for the per-section calls
+        Is : Log the token usage of a raw/parsed response and return the parsed output
+        """
+        self._log_usage(response, extracted_part)
+        if response["parsing_error"] is not None:
+            raise response["parsing_error"]
+        return response["parsed"]
+    
+    def _parse_all(self, response: dict, sections: list) -> dict:
+        """
+        Private Function for the single-call extraction
+        Is : Keep the valid sections of a raw/parsed structured output response
+        """
+        self._log_usage(response, self._parts_phrase(sections))
+        if response["parsed"] is not None:
+            return {section: getattr(response["parsed"], section) for section in sections}
+        
+        # The whole object failed validation: keep the sections that are valid on their own
+        self.logger.warning(f"Single-call extraction failed validation: {response['parsing_error']}")
+        try:
+            data = json.loads(response["raw"].content)
+        except (TypeError, ValueError):
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        schema = self.get_output_schema()
+        result = {}
+        for section in sections:
+            if data.get(section) is None:
+                continue
+            try:
+                result[section] = getattr(_section_schema(schema, section).model_validate({section: data[section]}), section)
+            except ValidationError:
+                self.logger.debug(f"Section {section} failed validation")
+        return result
+    
+    def _section_slices(self, layout_text: str) -> dict:
+        """
+        Private Function for the per-section calls
+        Is : Cut the text under each section heading found in a text that kept its line layout
+        """
+        if self.splitter is None:
+            return {}
+        slices = {section: text for section, text in self.splitter.split(layout_text).items() if section in self.get_sections()}
+        sizes = ", ".join(
+            f"{section} {len(slices[section])}" if section in slices else f"{section} (full text)"
+            for section in self.get_sections()
+        )
+        self.logger.info(f"{self.get_content_type_name()} slices ({len(layout_text)} chars): {sizes}")
+        return slices
+    
+    def _plan_calls(self, slices: dict, mode: str) -> list:
+        """
+        Private Function for the extraction modes
+        Is : Sections left to the single call: every section without a slice of its own
+        (sections with a slice always get a small per-section call on it)
+        """
+        if mode not in EXTRACTION_MODES:
+            raise ValueError(f"Unknown extraction mode: {mode}. Available: {', '.join(EXTRACTION_MODES)}")
+        self.last_usage = {"calls": 0, "prompt_tokens": 0, "output_tokens": 0}
+        if mode != "single":
+            return []
+        rest = [section for section in self.get_sections() if section not in slices]
+        # A single section left is just a per-section call on the whole content
+        return rest if len(rest) > 1 else []
+    
+    def _missing_sections(self, extracted: dict, together: list) -> list:
+        """Sections that need a per-section call after the single call"""
+        missing = [section for section in self.get_sections() if not extracted.get(section)]
+        if together:
+            fallback = [section for section in missing if section in together]
+            self.logger.info(
+                f"Single-call extraction of {', '.join(together)} done, "
+                f"per-section fallback for: {', '.join(fallback) or 'none'}"
+            )
+        return missing
+    
+    def _extract_sections(self, content: str, mode: str = "per_section", layout_text: Optional[str] = None) -> dict:
+        """
+        Extract every section of the content
+        
+        Args:
+            content: The content to process
+            mode: "per_section" (one call per section) or "single" (one call for all
+                sections without a slice, then one call per section that has a slice,
+                is empty or failed validation)
+            layout_text: The same document with its line layout kept, to cut the section
+                slices from (default: content)
+            
+        Returns:
+            dict: Section name -> extracted value, in the order of get_sections()
+        """
+        slices = self._section_slices(content if layout_text is None else layout_text)
+        together = self._plan_calls(slices, mode)
+        
+        extracted = {}
+        if together:
+            try:
+                extracted = self._pass_all_to_agent(content, together)
+            except Exception as e:
+                self.logger.warning(f"Single-call extraction failed, falling back to per-section calls: {str(e)}")
+        
+        for section in self._missing_sections(extracted, together):
+            extracted[section] = getattr(self._pass_to_agent(slices.get(section, content), section), section)
+            self.logger.debug(f"{section.capitalize()} extracted")
+        self.logger.info(f"{self.get_content_type_name()} extraction usage: {self.last_usage}")
+        return {section: extracted[section] for section in self.get_sections()}
+    
+    async def _aextract_sections(self, content: str, mode: str = "per_section", layout_text: Optional[str] = None) -> dict:
+        """
+        Async version of _extract_sections: the per-section calls are all issued at once
+        (bounded by the concurrency limit of the model, see LLMRegistry.set_concurrency)
+        """
+        slices = self._section_slices(content if layout_text is None else layout_text)
+        together = self._plan_calls(slices, mode)
+        
+        async def extract_together() -> dict:
+            try:
+                return await self._apass_all_to_agent(content, together)
+            except Exception as e:
+                self.logger.warning(f"Single-call extraction failed, falling back to per-section calls: {str(e)}")
+                return {}
+        
+        # The sliced sections do not wait for the single call
+        sliced = [section for section in self.get_sections() if section not in together]
+        results = await asyncio.gather(
+            extract_together() if together else asyncio.sleep(0, {}),
+            *(self._apass_to_agent(slices.get(section, content), section) for section in sliced)
+        )
+        extracted = dict(results[0])
+        for section, response in zip(sliced, results[1:]):
+            extracted[section] = getattr(response, section)
+        
+        missing = [section for section in self._missing_sections(extracted, together) if section in together]
+        responses = await asyncio.gather(*(self._apass_to_agent(content, section) for section in missing))
+        for section, response in zip(missing, responses):
+            extracted[section] = getattr(response, section)
+        self.logger.info(f"{self.get_content_type_name()} extraction usage: {self.last_usage}")
+        return {section: extracted[section] for section in self.get_sections()}
     
     @abstractmethod
     def flatten_objects_to_string(self, objects: Any) -> str:
@@ -110,3 +397,36 @@ class BaseProcessing(ABC):
             Processed and structured output
         """
         pass
+
+
+async def _arun_and_close(processing: BaseProcessing, content: str, mode: str) -> Any:
+    """Run arun in a fresh event loop, then release the loop's LLM clients"""
+    try:
+        return await processing.arun(content, mode=mode)
+    finally:
+        await LLMRegistry.aclose()
+
+
+def benchmark_extraction_modes(processing: BaseProcessing, content: str) -> list:
+    """
+    Compare the latency of the per-section and single-call extraction modes on the same content,
+    with sequential (run) and concurrent (arun) calls.
+
+    Returns:
+        list: One dict per mode and path with seconds and number of items per section
+    """
+    results = []
+    for mode in EXTRACTION_MODES:
+        for concurrent in (False, True):
+            start = time.perf_counter()
+            if concurrent:
+                output = asyncio.run(_arun_and_close(processing, content, mode))
+            else:
+                output = processing.run(content, mode=mode)
+            results.append({
+                "mode": mode,
+                "concurrent": concurrent,
+                "seconds": round(time.perf_counter() - start, 2),
+                "items": {section: len(output[section] or []) for section in processing.get_sections()}
+            })
+    return results
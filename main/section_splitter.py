@@ -0,0 +1,181 @@
+import re
+from typing import Dict, Mapping, Optional, Sequence
+
+from main.utils import LoggerSetup
+
+# Section heading lexicons: section name -> heading phrases (matched case-insensitively,
+# "&" also matches "and"). Headings listed under None only close the previous section.
+CV_HEADINGS: Dict[Optional[str], Sequence[str]] = {
+    "education": (
+        "education", "academic background", "academic qualifications", "academic history",
+        "education & training", "studies", "degrees", "diplomas", "formation"
+    ),
+    "skills": (
+        "skills", "technical skills", "key skills", "core skills", "hard skills", "soft skills",
+        "skills & tools", "core competencies", "competencies", "technologies", "tech stack",
+        "technical expertise", "areas of expertise", "expertise", "tools & technologies"
+    ),
+    "experience": (
+        "experience", "experiences", "professional experience", "work experience",
+        "relevant experience", "employment history", "employment", "work history",
+        "career history", "professional background", "internships"
+    ),
+    "certifications": (
+        "certifications", "certificates", "certification", "licenses & certifications",
+        "licences & certifications", "accreditations", "courses & certifications"
+    ),
+    "projects": (
+        "projects", "key projects", "personal projects", "academic projects", "selected projects",
+        "side projects", "notable projects", "project experience"
+    ),
+    None: (
+        "summary", "professional summary", "profile", "professional profile", "objective",
+        "career objective", "about me", "contact", "contact information", "languages",
+        "interests", "hobbies", "hobbies & interests", "references", "publications",
+        "awards", "honors & awards", "achievements", "volunteering", "volunteer experience"
+    ),
+}
+
+JD_HEADINGS: Dict[Optional[str], Sequence[str]] = {
+    "requirements": (
+        "requirements", "job requirements", "key requirements", "required skills",
+        "must have", "must-have", "must haves", "what you need", "what you'll need",
+        "what you will need", "what we're looking for", "what we are looking for",
+        "who you are", "your profile", "profile required", "skills & experience"
+    ),
+    "responsibilities": (
+        "responsibilities", "key responsibilities", "main responsibilities", "duties",
+        "job duties", "what you'll do", "what you will do", "your role", "the role",
+        "role description", "job description", "your mission", "missions", "day to day",
+        "day-to-day", "your tasks", "tasks"
+    ),
+    "qualifications": (
+        "qualifications", "required qualifications", "minimum qualifications",
+        "preferred qualifications", "basic qualifications", "education & qualifications",
+        "nice to have", "nice-to-have", "bonus points", "preferred skills", "pluses"
+    ),
+    None: (
+        "about us", "about the company", "who we are", "company overview", "overview",
+        "benefits", "perks", "perks & benefits", "what we offer", "we offer", "compensation",
+        "salary", "how to apply", "location", "equal opportunity"
+    ),
+}
+
+# Layout cues: a heading starts a line, may be decorated (markdown #, bullets, rules,
+# numbering) and is either alone on its line (optionally followed by a colon) or an
+# inline label ("Skills: Java, Python") that only covers the rest of its line.
+_DECORATION = r"[ \t]*(?:[#*=_•·>|\-]+[ \t]*|\d{1,2}[.)][ \t]*|[ivx]{1,4}[.)][ \t]+)?"
+_TRAILER = r"[ \t]*(?:[#*=_\-]+[ \t]*)?"
+
+
+def _phrase_pattern(phrase: str) -> str:
+    words = [re.escape(word).replace("'", "['’]") if word != "&" else r"(?:&|and)" for word in phrase.split()]
+    return r"[ \t]+".join(words)
+
+
+class SectionSplitter:
+    """
+    Fast deterministic pre-segmentation of CVs and job descriptions by their headings.
+    One compiled regular expression finds every heading of the lexicon at the start of
+    a line; the text under a heading (up to the next one) is the slice of its section.
+    Main Exposed Functions
+    Is : split(self, text: str) -> dict section -> slice
+    Is : slice_for(self, text: str, section: str) -> slice, or the whole text
+    """
+
+    def __init__(self, headings: Mapping[Optional[str], Sequence[str]]):
+        """
+        Args:
+            headings: Section name -> heading phrases (None: headings that only end a section)
+        """
+        self.logger = LoggerSetup.get_logger(__name__)
+        self._sections = {}
+        for section, phrases in headings.items():
+            for phrase in phrases:
+                self._sections[" ".join(phrase.lower().replace(" and ", " & ").split())] = section
+        # Longest phrases first, so "work experience" wins over "experience"
+        alternatives = "|".join(_phrase_pattern(phrase) for phrase in sorted(self._sections, key=len, reverse=True))
+        self._heading = re.compile(
+            rf"^{_DECORATION}(?P<heading>{alternatives}){_TRAILER}"
+            rf"(?::?[ \t]*$|:[ \t]*(?P<inline>\S[^\n]*)$)",
+            re.IGNORECASE | re.MULTILINE
+        )
+        self.logger.info(f"SectionSplitter initialized with {len(self._sections)} headings")
+
+    def _section_of(self, heading: str) -> Optional[str]:
+        words = heading.lower().replace("’", "'").replace(" and ", " & ").split()
+        return self._sections.get(" ".join(words))
+
+    def split(self, text: str) -> Dict[str, str]:
+        """
+        Cut a text into the slices of its sections
+        Is : split(self, text: str) -> dict section -> slice
+
+        Returns:
+            dict: Section name -> text under its heading(s), for the sections found.
+            Text before the first heading and under ignored headings is left out.
+        """
+        parts: Dict[str, list] = {}
+        section, start = None, 0
+        for match in self._heading.finditer(text):
+            matched = self._section_of(match.group("heading"))
+            if match.group("inline") is not None:
+                # Inline label: the rest of the line belongs to its section, the block goes on
+                if matched is not None:
+                    parts.setdefault(matched, []).append(match.group("inline"))
+                continue
+            if section is not None:
+                parts[section].append(text[start:match.start()])
+            section, start = matched, match.end()
+            if section is not None:
+                parts.setdefault(section, [])
+        if section is not None:
+            parts[section].append(text[start:])
+
+        slices = {}
+        for name, pieces in parts.items():
+            content = "\n".join(piece.strip() for piece in pieces if piece.strip())
+            if content:
+                slices[name] = content
+        return slices
+
+    def slice_for(self, text: str, section: str, slices: Optional[Dict[str, str]] = None) -> str:
+        """
+        Get the text to extract one section from
+        Is : slice_for(self, text: str, section: str) -> slice, or the whole text
+
+        Args:
+            text: Whole text
+            section: Section name
+            slices: Result of split(text) when already computed
+
+        Returns:
+            str: The slice of the section, or the whole text when its heading was not found
+        """
+        if slices is None:
+            slices = self.split(text)
+        return slices.get(section) or text
+
+
+if __name__ == "__main__":
+    sample = """John Doe | Backend Engineer | john@doe.dev
+
+PROFESSIONAL SUMMARY
+Backend engineer with 6 years of Java and Python.
+
+TECHNICAL SKILLS
+Java, Spring Boot, PostgreSQL, Docker
+
+Work Experience:
+Senior Engineer | ACME | 2021 - 2025
+Built the billing platform.
+
+## Education
+MSc Computer Science, ENSAM, 2019
+
+Certifications: AWS Solutions Architect, GCP Digital Leader
+"""
+    splitter = SectionSplitter(CV_HEADINGS)
+    for name, content in splitter.split(sample).items():
+        print(f"[{name}]\n{content}\n")
+    print(f"[projects fallback] {len(splitter.slice_for(sample, 'projects'))} chars (whole text)")
@@ -1,57 +1,75 @@
-from langchain_ollama import ChatOllama
-from main.utils import LoggerSetup
+from main.utils import LoggerSetup, DiskCache, LLMRegistry
+import hashlib
 import json
+import re
+import time
+from typing import List, Optional
 from main.summaryOutput import SummaryOutput
 
+SUMMARY_MODES = ("auto", "single", "map_reduce")
+# Section boundaries: blank lines first, then single line breaks, then sentence ends
+_SECTION_SEPARATORS = (re.compile(r"\n\s*\n"), re.compile(r"\n"), re.compile(r"(?<=[.!?;])\s+"))
+# Smallest extraction target given to a single chunk of a map-reduce run
+_MIN_CHUNK_TARGET = 200
+
+
 class SummaryTranslation:
     """
     Text Processing for Summary and Translation using Granite3-Dense:8B
-    Single function, single LLM call - summarizes and translates in one go.
+    Short texts: single function, single LLM call - summarizes and translates in one go.
+    Long texts: map-reduce - sections are summarized concurrently, then merged in one final call.
     """
     
-    def __init__(self, model: str = "granite3-dense:8b"):
-        """Initialize with model name"""
-        self.logger = LoggerSetup.get_logger(__name__)
-        self.model = model
-        self.logger.info(f"SummaryTranslation initialized with model: {model}")
+    # Bump whenever the prompts change, so cached outputs of older prompts are not reused
+    PROMPT_VERSION = 1
     
-    def run(
-        self, 
-        content: str, 
-        target_length: int = 200,
-        target_language: str = "English"
-    ) -> str:
+    def __init__(
+        self,
+        model: str = "granite3-dense:8b",
+        chunk_chars: int = 6000,
+        max_concurrency: int = 4,
+        cache: Optional[DiskCache] = None
+    ):
         """
-        Extract key information and translate text in ONE LLM call
+        Initialize with model name
         
         Args:
-            content: Text to process
-            target_length: Target length in characters
-            target_language: Target language for extraction
-            
-        Returns:
-            Information-dense extracted text in target language
+            model: Ollama model name
+            chunk_chars: Largest chunk (in characters) sent in one map call, longer texts use map-reduce in auto mode
+            max_concurrency: Maximum number of map calls in flight at once (the Ollama server
+                only runs them in parallel with OLLAMA_NUM_PARALLEL > 1)
+            cache: Optional persistent cache of outputs, keyed by content, settings, model and prompt version
         """
-        self.logger.info(f"Processing text: {len(content)} chars → {target_length} chars key extraction + {target_language} translation")
-        
-        try:
-            llm = ChatOllama(
-                model=self.model,
-                temperature=0.3,
-                reasoning=False,
-                format="json"
-            ).with_structured_output(schema=SummaryOutput)
-            
-            system_message = {
-                "role": "system",
-                "content": f"""You are an expert information extractor for CV-Job matching systems.
+        self.logger = LoggerSetup.get_logger(__name__)
+        self.model = model
+        self.chunk_chars = chunk_chars
+        self.max_concurrency = max_concurrency
+        self.cache = cache
+        self.logger.info(f"SummaryTranslation initialized with model: {model} (chunks of {chunk_chars} chars, concurrency {max_concurrency})")
+    
+    def _llm(self):
+        """Structured-output chat model used by every call (shared through the LLM registry)"""
+        return LLMRegistry.chat(
+            self.model,
+            schema=SummaryOutput,
+            temperature=0.3,
+            reasoning=False,
+            format="json"
+        )
+    
+    def _system_message(self, target_language: str) -> dict:
+        return {
+            "role": "system",
+            "content": f"""You are an expert information extractor for CV-Job matching systems.
 CRITICAL: The downstream matching system is BLIND and will ONLY see your extracted output.
 Extract ALL key matching components and translate to {target_language}."""
-            }
-            
-            user_message = {
-                "role": "user",
-                "content": f"""Extract key information from this CV/Job Description for matching purposes.
+        }
+    
+    def _extraction_messages(self, content: str, target_length: int, target_language: str) -> list:
+        """Prompt extracting key information from one text (the whole document or one chunk)"""
+        user_message = {
+            "role": "user",
+            "content": f"""Extract key information from this CV/Job Description for matching purposes.
 
 CRITICAL INSTRUCTIONS:
 1. Extract ALL key components: skills, technologies, experience, qualifications, requirements, responsibilities
@@ -66,13 +84,147 @@ Text to extract from:
 {content}
 
 Return the information-dense extracted {target_language} text with ALL key matching components."""
-            }
+        }
+        return [self._system_message(target_language), user_message]
+    
+    def _merge_messages(self, extracts: List[str], target_length: int, target_language: str) -> list:
+        """Prompt merging the partial extracts of consecutive document sections"""
+        sections = "\n\n".join(f"Part {i}:\n{extract}" for i, extract in enumerate(extracts, 1))
+        user_message = {
+            "role": "user",
+            "content": f"""Merge these partial extracts of consecutive parts of ONE CV/Job Description into a single extract for matching purposes.
+
+CRITICAL INSTRUCTIONS:
+1. Keep ALL key components: skills, technologies, experience, qualifications, requirements, responsibilities
+2. Preserve specific technical terms, tools, frameworks, certifications, years of experience
+3. Remove repetitions between parts, never drop matching-relevant information
+4. Be information-dense, prioritize completeness over brevity
+5. Write in {target_language}
+6. Target approximately {target_length} characters (but prioritize completeness)
+
+Partial extracts:
+{sections}
+
+Return the single information-dense {target_language} extract with ALL key matching components."""
+        }
+        return [self._system_message(target_language), user_message]
+    
+    def split_sections(self, content: str) -> List[str]:
+        """
+        Split a text into chunks of at most chunk_chars characters on section boundaries
+        (blank lines, then line breaks, then sentence ends, then hard cuts for a single huge run).
+        """
+        def split(text: str, level: int) -> List[str]:
+            if len(text) <= self.chunk_chars:
+                return [text]
+            if level == len(_SECTION_SEPARATORS):
+                return [text[i:i + self.chunk_chars] for i in range(0, len(text), self.chunk_chars)]
+            pieces = []
+            for part in _SECTION_SEPARATORS[level].split(text):
+                pieces.extend(split(part, level + 1))
+            return pieces
+
+        chunks = []
+        current = ""
+        # Pack consecutive sections greedily into chunks
+        for piece in split(content.strip(), 0):
+            piece = piece.strip()
+            if not piece:
+                continue
+            if current and len(current) + 2 + len(piece) > self.chunk_chars:
+                chunks.append(current)
+                current = piece
+            else:
+                current = f"{current}\n\n{piece}" if current else piece
+        if current:
+            chunks.append(current)
+        return chunks
+    
+    def _run_map_reduce(self, chunks: List[str], target_length: int, target_language: str) -> str:
+        """
+        Summarize every chunk concurrently (map), then merge the extracts in one call (reduce).
+        """
+        llm = self._llm()
+        total = sum(len(chunk) for chunk in chunks)
+        map_inputs = [
+            self._extraction_messages(
+                chunk, max(_MIN_CHUNK_TARGET, target_length * len(chunk) // total), target_language
+            )
+            for chunk in chunks
+        ]
+        start = time.perf_counter()
+        responses = llm.batch(map_inputs, config={"max_concurrency": self.max_concurrency})
+        extracts = [response.output for response in responses]
+        self.logger.info(
+            f"Map step: {len(chunks)} chunks summarized in {time.perf_counter() - start:.2f}s "
+            f"({sum(len(extract) for extract in extracts)} chars of partial extracts)"
+        )
+        
+        start = time.perf_counter()
+        response = llm.invoke(self._merge_messages(extracts, target_length, target_language))
+        self.logger.info(f"Reduce step: extracts merged in {time.perf_counter() - start:.2f}s")
+        return response.output
+    
+    def _cache_key(self, content: str, target_length: int, target_language: str, map_reduce: bool) -> str:
+        """
+        Build the cache key of an output from the content hash and every setting that shapes it.
+        """
+        content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        settings = {
+            "prompt_version": self.PROMPT_VERSION,
+            "model": self.model,
+            "target_length": target_length,
+            "target_language": target_language,
+            "mode": "map_reduce" if map_reduce else "single",
+            "chunk_chars": self.chunk_chars if map_reduce else None
+        }
+        return DiskCache.make_key(content_hash, settings)
+    
+    def run(
+        self, 
+        content: str, 
+        target_length: int = 200,
+        target_language: str = "English",
+        mode: str = "auto"
+    ) -> str:
+        """
+        Extract key information and translate text, in ONE LLM call for short texts
+        
+        Args:
+            content: Text to process
+            target_length: Target length in characters
+            target_language: Target language for extraction
+            mode: "single" (one call), "map_reduce" (chunked), or "auto" (map-reduce above chunk_chars)
             
-            response = llm.invoke([system_message, user_message])
+        Returns:
+            Information-dense extracted text in target language
+        """
+        if mode not in SUMMARY_MODES:
+            raise ValueError(f"Invalid summary mode: {mode}. Supported modes: {', '.join(SUMMARY_MODES)}")
+        self.logger.info(f"Processing text: {len(content)} chars → {target_length} chars key extraction + {target_language} translation")
+        
+        try:
+            chunks = self.split_sections(content) if mode != "single" else [content]
+            map_reduce = len(chunks) > 1 and (mode == "map_reduce" or len(content) > self.chunk_chars)
+            if self.cache is not None:
+                key = self._cache_key(content, target_length, target_language, map_reduce)
+                cached = self.cache.get(key)
+                if cached is not None:
+                    self.logger.info(f"Summary cache hit: {len(cached)} chars (cache stats: {self.cache.stats()})")
+                    return cached
+            
+            if map_reduce:
+                self.logger.info(f"Using map-reduce over {len(chunks)} chunks")
+                extracted = self._run_map_reduce(chunks, target_length, target_language)
+            else:
+                response = self._llm().invoke(self._extraction_messages(content, target_length, target_language))
+                extracted = response.output
             
             # Allow 20% overflow to preserve critical information
             max_length = int(target_length * 1.2)
-            output = response.output[:max_length] if len(response.output) > max_length else response.output
+            output = extracted[:max_length] if len(extracted) > max_length else extracted
+            if self.cache is not None:
+                self.cache.set(key, output)
             
             self.logger.info(f"Successfully extracted key information: {len(output)} chars")
             return output
@@ -82,6 +234,28 @@ Return the information-dense extracted {target_language} text with ALL key match
             raise
 
 
+def benchmark_summary_modes(content: str, target_length: int = 1000, model: str = "granite3-dense:8b",
+                            chunk_chars: int = 6000, max_concurrency: int = 4) -> list:
+    """
+    Compare end-to-end latency of the single-shot and map-reduce paths on the same text.
+
+    Returns:
+        list: One dict per mode with seconds, number of chunks and output length
+    """
+    processor = SummaryTranslation(model=model, chunk_chars=chunk_chars, max_concurrency=max_concurrency)
+    results = []
+    for mode in ("single", "map_reduce"):
+        start = time.perf_counter()
+        output = processor.run(content, target_length=target_length, mode=mode)
+        results.append({
+            "mode": mode,
+            "seconds": round(time.perf_counter() - start, 2),
+            "chunks": 1 if mode == "single" else len(processor.split_sections(content)),
+            "output_chars": len(output)
+        })
+    return results
+
+
 # Example usage
 if __name__ == "__main__":
     processor = SummaryTranslation(model="granite3-dense:8b")
@@ -95,4 +269,8 @@ if __name__ == "__main__":
     
     result = processor.run(sample_text, target_length=150, target_language="Spanish")
     print(f"Result ({len(result)} chars): {result}")
-
+    
+    # Latency of single-shot vs map-reduce on a long document
+    long_text = "\n\n".join([sample_text.strip()] * 60)
+    for row in benchmark_summary_modes(long_text, target_length=1000, chunk_chars=4000):
+        print(row)
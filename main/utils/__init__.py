@@ -1,8 +1,14 @@
 from .logger import LoggerSetup
 from .saver import Saver
+from .cache import DiskCache
+from .nltk_resources import NltkResources
+from .llm_registry import LLMRegistry
 
 
 __all__ = [
     "LoggerSetup",
-    "Saver"
+    "Saver",
+    "DiskCache",
+    "NltkResources",
+    "LLMRegistry"
 ]
@@ -0,0 +1,129 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional, Union
+
+
+class DiskCache:
+    """
+    Persistent, content-addressed cache for text results.
+    Entries live in a single SQLite file so the cache survives restarts and can be
+    shared by several processes. The total size is bounded and the least recently
+    used entries are evicted first. Entries can also expire after a time to live.
+    """
+
+    def __init__(self, path: Union[str, Path], max_bytes: int = 512 * 1024 * 1024, ttl_seconds: Optional[float] = None):
+        """
+        Args:
+            path (str | Path): Path of the SQLite cache file (parent folders are created)
+            max_bytes (int): Maximum total size of the cached values in bytes
+            ttl_seconds (float | None): Entries older than this are treated as missing and deleted (None: never expire)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+                "created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """
+        Build a cache key from JSON-serialisable parts.
+
+        Returns:
+            str: SHA-256 hex digest of the parts
+        """
+        payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Return the cached value for key, or None on a miss.
+        """
+        with self._lock:
+            row = self._connection.execute("SELECT value, created FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            now = time.time()
+            with self._connection:
+                if self.ttl_seconds is not None and now - row[1] > self.ttl_seconds:
+                    self._connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+                    self.expirations += 1
+                    self.misses += 1
+                    return None
+                self._connection.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, value: str) -> None:
+        """
+        Store value under key, evicting least recently used entries if the cache grows too large.
+        """
+        size = len(value.encode("utf-8"))
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now)
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        """
+        Delete expired entries, then least recently used entries until the total size fits max_bytes.
+        Must be called with the lock held, inside a transaction.
+        """
+        if self.ttl_seconds is not None:
+            expired = self._connection.execute(
+                "DELETE FROM entries WHERE created < ?", (time.time() - self.ttl_seconds,)
+            ).rowcount
+            self.expirations += max(expired, 0)
+        total = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._connection.execute("SELECT key, size FROM entries ORDER BY accessed").fetchall():
+            if total <= self.max_bytes:
+                break
+            self._connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        """
+        Return hit/miss counters and the current size of the cache.
+        """
+        with self._lock:
+            entries, total = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "entries": entries,
+            "bytes": total
+        }
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,195 @@
+import asyncio
+import json
+import threading
+from typing import Any, Optional
+
+from langchain_ollama import ChatOllama, OllamaEmbeddings
+
+
+class LLMRegistry:
+    """
+    Process-wide registry of configured Ollama runnables.
+    A chat model (optionally bound to a structured output schema) is built once per
+    (model, options, schema) and reused by every caller, and all models talking to
+    the same Ollama host share one pair of HTTP clients, so their keep-alive
+    connection pool is reused instead of being set up again for each call.
+    Async callers use achat(): asyncio HTTP connections are bound to the event loop
+    that opened them, so async runnables, clients and concurrency limits are kept
+    per event loop, until the loop's owner awaits aclose() before the loop ends.
+    """
+
+    # Maximum number of calls in flight per model and event loop (the Ollama server
+    # only runs them in parallel with OLLAMA_NUM_PARALLEL > 1)
+    DEFAULT_CONCURRENCY = 4
+
+    _runnables = {}
+    _clients = {}
+    _concurrency = {}
+    _loops = {}
+    _counters = {"runnables_created": 0, "runnables_reused": 0, "clients_created": 0, "clients_reused": 0}
+    _lock = threading.RLock()
+
+    @classmethod
+    def chat(cls, model: str, schema: Any = None, base_url: Optional[str] = None,
+             include_raw: bool = False, **options) -> Any:
+        """
+        Get the shared chat runnable for a model, its options and an optional output schema.
+
+        Args:
+            model (str): Ollama model name
+            schema: Optional Pydantic schema bound with with_structured_output
+            base_url (str | None): Ollama host (None: OLLAMA_HOST or the local default)
+            include_raw (bool): Return the raw message and parsing error along with the parsed output
+            **options: ChatOllama options (temperature, format, reasoning, ...)
+
+        Returns:
+            The ChatOllama instance, or its structured output runnable when a schema is given
+        """
+        key = ("chat", model, base_url, cls._options_key(options), schema, include_raw)
+        with cls._lock:
+            runnable = cls._runnables.get(key)
+            if runnable is not None:
+                cls._counters["runnables_reused"] += 1
+                return runnable
+            llm = cls._share_clients(ChatOllama(model=model, base_url=base_url, **options), base_url)
+            runnable = llm.with_structured_output(schema=schema, include_raw=include_raw) if schema is not None else llm
+            cls._runnables[key] = runnable
+            cls._counters["runnables_created"] += 1
+            return runnable
+
+    @classmethod
+    def achat(cls, model: str, schema: Any = None, base_url: Optional[str] = None,
+              include_raw: bool = False, **options) -> Any:
+        """
+        Get the chat runnable to await (ainvoke) from the running event loop.
+        Same arguments as chat(); the runnable and its async client are shared by the
+        callers of the running loop only.
+        """
+        key = ("chat", model, base_url, cls._options_key(options), schema, include_raw)
+        with cls._lock:
+            state = cls._loop_state()
+            runnable = state["runnables"].get(key)
+            if runnable is not None:
+                cls._counters["runnables_reused"] += 1
+                return runnable
+            llm = ChatOllama(model=model, base_url=base_url, **options)
+            # The sync client is loop independent: share it with the other models of the host
+            sync_client = cls._clients.get(base_url)
+            if sync_client is not None:
+                llm._client = sync_client[0]
+            async_client = state["clients"].get(base_url)
+            if async_client is None:
+                state["clients"][base_url] = llm._async_client
+                cls._counters["clients_created"] += 1
+            else:
+                llm._async_client = async_client
+                cls._counters["clients_reused"] += 1
+            runnable = llm.with_structured_output(schema=schema, include_raw=include_raw) if schema is not None else llm
+            state["runnables"][key] = runnable
+            cls._counters["runnables_created"] += 1
+            return runnable
+
+    @classmethod
+    def limit(cls, model: str) -> asyncio.Semaphore:
+        """
+        Get the semaphore bounding the calls in flight to a model from the running event loop.
+
+        Usage:
+            async with LLMRegistry.limit(model):
+                await runnable.ainvoke(messages)
+        """
+        with cls._lock:
+            semaphores = cls._loop_state()["semaphores"]
+            semaphore = semaphores.get(model)
+            if semaphore is None:
+                semaphore = semaphores[model] = asyncio.Semaphore(cls._concurrency.get(model, cls.DEFAULT_CONCURRENCY))
+            return semaphore
+
+    @classmethod
+    def set_concurrency(cls, model: str, limit: int) -> None:
+        """
+        Set the maximum number of calls in flight to a model (per event loop).
+        Applies to the event loops that did not call the model yet.
+        """
+        if limit < 1:
+            raise ValueError(f"Concurrency limit must be at least 1, got {limit}")
+        with cls._lock:
+            cls._concurrency[model] = limit
+
+    @classmethod
+    def _loop_state(cls) -> dict:
+        """
+        Runnables, async clients and semaphores of the running event loop.
+        Kept until aclose() is awaited from the loop. Must be called with the lock held.
+        """
+        loop = asyncio.get_running_loop()
+        state = cls._loops.get(loop)
+        if state is None:
+            state = cls._loops[loop] = {"runnables": {}, "clients": {}, "semaphores": {}}
+        return state
+
+    @classmethod
+    async def aclose(cls) -> None:
+        """
+        Close the async HTTP clients of the running event loop and forget its runnables
+        and semaphores. To be awaited by whoever owns the loop (e.g. in a finally block of
+        the coroutine given to asyncio.run), since the state refers back to the loop.
+        """
+        with cls._lock:
+            state = cls._loops.pop(asyncio.get_running_loop(), None)
+        if state is None:
+            return
+        for client in state["clients"].values():
+            await client.close()
+
+    @classmethod
+    def embeddings(cls, model: str, base_url: Optional[str] = None, **options) -> OllamaEmbeddings:
+        """
+        Get the shared embeddings model, using the same host clients as the chat models.
+        """
+        key = ("embeddings", model, base_url, cls._options_key(options), None, False)
+        with cls._lock:
+            embeddings = cls._runnables.get(key)
+            if embeddings is not None:
+                cls._counters["runnables_reused"] += 1
+                return embeddings
+            embeddings = cls._share_clients(OllamaEmbeddings(model=model, base_url=base_url, **options), base_url)
+            cls._runnables[key] = embeddings
+            cls._counters["runnables_created"] += 1
+            return embeddings
+
+    @classmethod
+    def _share_clients(cls, model: Any, base_url: Optional[str]) -> Any:
+        """
+        Point a freshly built model at the HTTP clients of its host.
+        The first model of a host donates the clients it created.
+        Must be called with the lock held.
+        """
+        clients = cls._clients.get(base_url)
+        if clients is None:
+            cls._clients[base_url] = (model._client, model._async_client)
+            cls._counters["clients_created"] += 1
+        else:
+            model._client, model._async_client = clients
+            cls._counters["clients_reused"] += 1
+        return model
+
+    @staticmethod
+    def _options_key(options: dict) -> str:
+        return json.dumps(options, sort_keys=True, default=str)
+
+    @classmethod
+    def stats(cls) -> dict:
+        """
+        Return how many runnables and host clients were created and reused.
+        """
+        with cls._lock:
+            return {**cls._counters, "runnables": len(cls._runnables), "hosts": len(cls._clients)}
+
+    @classmethod
+    def clear(cls) -> None:
+        """Forget every cached runnable and client (the counters are kept)."""
+        with cls._lock:
+            cls._runnables.clear()
+            cls._clients.clear()
+            cls._loops.clear()
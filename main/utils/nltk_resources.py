@@ -0,0 +1,101 @@
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+import nltk
+from nltk.tokenize import punkt
+
+# NLTK >= 3.9 tokenizes with the pickle-free punkt_tab tables instead of the punkt pickles
+if hasattr(punkt, "PunktTokenizer"):
+    _PUNKT, _PUNKT_PATH = "punkt_tab", "tokenizers/punkt_tab/english/"
+else:
+    _PUNKT, _PUNKT_PATH = "punkt", "tokenizers/punkt/english.pickle"
+
+
+class NltkResources:
+    """
+    Offline resolver for the NLTK data used by the pipeline.
+    Resources are looked up in the local data directories only (never downloaded),
+    each one at most once per process, and only when a step first needs it.
+    A missing resource raises a LookupError naming the command that installs it.
+    """
+
+    # Environment variable pointing at the local NLTK data directory
+    DATA_DIR_ENV = "NLTK_DATA"
+
+    # Resource name -> path inside the data directory
+    RESOURCES = {
+        _PUNKT: _PUNKT_PATH,
+        "stopwords": "corpora/stopwords",
+        "wordnet": "corpora/wordnet",
+    }
+
+    _resolved: Dict[str, str] = {}
+    _data_dir: Optional[Path] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def configure(cls, data_dir: Union[str, Path, None] = None) -> Optional[Path]:
+        """
+        Register the local NLTK data directory (first in the search path).
+
+        Args:
+            data_dir (str | Path | None): Data directory, defaults to the NLTK_DATA environment variable
+
+        Returns:
+            Path | None: The configured data directory
+        """
+        if data_dir is None:
+            data_dir = os.environ.get(cls.DATA_DIR_ENV)
+        if data_dir is None:
+            return cls._data_dir
+        data_dir = Path(data_dir).expanduser()
+        with cls._lock:
+            if str(data_dir) not in nltk.data.path:
+                nltk.data.path.insert(0, str(data_dir))
+            cls._data_dir = data_dir
+        return data_dir
+
+    @classmethod
+    def require(cls, name: str) -> str:
+        """
+        Resolve a resource from the local data directories, once per process.
+
+        Args:
+            name (str): Resource name (punkt/punkt_tab, stopwords, wordnet)
+
+        Returns:
+            str: Location of the resource on disk
+
+        Raises:
+            LookupError: If the resource is not installed locally
+        """
+        location = cls._resolved.get(name)
+        if location is not None:
+            return location
+        if name == "punkt":
+            name = _PUNKT
+        with cls._lock:
+            if name in cls._resolved:
+                return cls._resolved[name]
+            try:
+                location = str(nltk.data.find(cls.RESOURCES.get(name, name)))
+            except LookupError:
+                target = cls._data_dir or os.environ.get(cls.DATA_DIR_ENV) or "<nltk_data dir>"
+                raise LookupError(
+                    f"NLTK resource '{name}' is not installed. Searched: {', '.join(map(str, nltk.data.path))}. "
+                    f"Install it offline with: python -m nltk.downloader -d {target} {name}"
+                ) from None
+            cls._resolved[name] = location
+            return location
+
+    @classmethod
+    def require_all(cls) -> Dict[str, str]:
+        """
+        Resolve every resource used by the pipeline (fail-fast startup check).
+
+        Returns:
+            dict: Resource name -> location on disk
+        """
+        return {name: cls.require(name) for name in cls.RESOURCES}
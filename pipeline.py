@@ -6,18 +6,35 @@ Orchestrates the complete evaluation pipeline from document loading to final dec
 from main import (
     LoggerSetup,
     Saver,
+    DiskCache,
     CvProcessing,
     DescProcessing,
     Embeddings,
     Generation,
     EvaluationReport,
-    SummaryTranslation
+    SummaryTranslation,
+    LanguageDetector,
+    LLMRegistry
 )
 from main.retreival import Retreival
 from main.cleaning import Cleaning
+from main.processing import BaseProcessing, EXTRACTION_MODES
+import asyncio
 import time
 from pathlib import Path
-from typing import Callable, Optional
+from typing import Callable, Dict, Optional
+
+# Persistent caches shared across pipeline runs
+CACHE_DIR = Path(__file__).parent / "cache"
+# Summaries only depend on their inputs; expire them so model updates are eventually picked up
+SUMMARY_CACHE_TTL = 30 * 24 * 3600
+# Optional word list used to pre-warm the stem/lemma caches of the cleaning stage
+VOCABULARY_PATH = CACHE_DIR / "vocabulary.txt"
+# Cleaning profile (see main.cleaning.CLEANING_PROFILES) used for each document type
+DEFAULT_CLEANING_PROFILES = {"cv": "full", "jd": "full"}
+# Structured extraction mode (see main.processing.EXTRACTION_MODES): one call per document,
+# with a per-section call only for sections that come back empty or invalid
+DEFAULT_EXTRACTION_MODE = "single"
 
 
 class RecruitmentPipeline:
@@ -32,16 +49,37 @@ class RecruitmentPipeline:
     5. Final Evaluation (LLM-based decision)
     """
     
-    def __init__(self):
+    def __init__(self, cleaning_profiles: Optional[Dict[str, str]] = None,
+                 extraction_mode: str = DEFAULT_EXTRACTION_MODE,
+                 extraction_concurrency: int = LLMRegistry.DEFAULT_CONCURRENCY):
+        """
+        Args:
+            cleaning_profiles: Optional overrides of the cleaning profile per document type ("cv", "jd")
+            extraction_mode: Structured extraction mode, "single" or "per_section"
+            extraction_concurrency: Maximum number of extraction calls in flight at once
+        """
         self.logger = LoggerSetup.get_logger(__name__)
         self.logger.info("=" * 80)
         self.logger.info("Initializing Recruitment Pipeline")
         self.logger.info("=" * 80)
         
         # Initialize all pipeline components
-        self.retrieval = Retreival()
-        self.cleaning = Cleaning()
-        self.summary_translation = SummaryTranslation()
+        self.retrieval = Retreival(cache=DiskCache(CACHE_DIR / "documents.sqlite3"))
+        self.language_detector = LanguageDetector()
+        self.cleaning = Cleaning(
+            vocabulary_path=VOCABULARY_PATH if VOCABULARY_PATH.exists() else None,
+            language_detector=self.language_detector
+        )
+        self.cleaning_profiles = {**DEFAULT_CLEANING_PROFILES, **(cleaning_profiles or {})}
+        for profile in self.cleaning_profiles.values():
+            self.cleaning.resolve_profile(profile)
+        self.summary_translation = SummaryTranslation(
+            cache=DiskCache(CACHE_DIR / "summaries.sqlite3", ttl_seconds=SUMMARY_CACHE_TTL)
+        )
+        if extraction_mode not in EXTRACTION_MODES:
+            raise ValueError(f"Unknown extraction mode: {extraction_mode}. Available: {', '.join(EXTRACTION_MODES)}")
+        self.extraction_mode = extraction_mode
+        LLMRegistry.set_concurrency(BaseProcessing.MODEL, extraction_concurrency)
         self.cv_processing = CvProcessing()
         self.desc_processing = DescProcessing()
         self.embeddings = Embeddings()
@@ -49,6 +87,57 @@ class RecruitmentPipeline:
         
         self.logger.info("All pipeline components initialized successfully")
     
+    def _layout_text(self, raw: str) -> Optional[str]:
+        """
+        Private Function for stage 3
+        Is : The raw document with only its layout repaired ("minimal" profile), so section
+        headings stay on their own lines for the section splitter. None when the document is
+        not in English: its slices would bypass the summary/translation of stage 2.
+        """
+        if not self.language_detector.is_language(raw, "English"):
+            return None
+        return self.cleaning.run(raw, profile="minimal")
+
+    def _extract_structured(self, cv_clean: str, jd_clean: str,
+                            cv_layout: Optional[str] = None, jd_layout: Optional[str] = None) -> tuple:
+        """
+        Private Function for stage 3
+        Is : Extract the CV and JD sections, every LLM call of both documents in flight at once
+        (one document after the other when called from a running event loop)
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self._aextract_structured(cv_clean, jd_clean, cv_layout, jd_layout))
+        self.logger.warning("Event loop already running: CV and Job Description extracted sequentially")
+        return (
+            self.cv_processing.run(cv_clean, output_format="json", mode=self.extraction_mode, layout_text=cv_layout),
+            self.desc_processing.run(jd_clean, output_format="json", mode=self.extraction_mode, layout_text=jd_layout)
+        )
+
+    async def _aextract_structured(self, cv_clean: str, jd_clean: str,
+                                   cv_layout: Optional[str] = None, jd_layout: Optional[str] = None) -> tuple:
+        stage_start = time.time()
+
+        async def timed(label: str, extraction):
+            result = await extraction
+            self.logger.info(f"✓ {label} structured extraction completed in {time.time() - stage_start:.2f}s")
+            return result
+
+        self.logger.info("Processing CV and Job Description concurrently...")
+        try:
+            return await asyncio.gather(
+                timed("CV", self.cv_processing.arun(
+                    cv_clean, output_format="json", mode=self.extraction_mode, layout_text=cv_layout
+                )),
+                timed("JD", self.desc_processing.arun(
+                    jd_clean, output_format="json", mode=self.extraction_mode, layout_text=jd_layout
+                ))
+            )
+        finally:
+            # The loop of asyncio.run ends here: release its async clients and semaphores
+            await LLMRegistry.aclose()
+
     def run(
         self,
         cv_path: str,
@@ -96,6 +185,7 @@ class RecruitmentPipeline:
             self.logger.info(f"✓ Documents loaded successfully in {stage_elapsed:.2f}s")
             self.logger.info(f"  CV length: {len(cv_raw)} characters")
             self.logger.info(f"  JD length: {len(jd_raw)} characters")
+            self.logger.info(f"  Document cache: {self.retrieval.cache.stats()}")
 
             if on_step_progress:
                 on_step_progress("Documents loaded successfully", 20)
@@ -119,13 +209,31 @@ class RecruitmentPipeline:
                 )
             
             stage_start = time.time()
-            cv_clean = self.cleaning.run(cv_raw, translation_callback=translate_to_english)
-            jd_clean = self.cleaning.run(jd_raw, translation_callback=translate_to_english)
+            # Texts already in English and within the summary budget skip the LLM call
+            max_untranslated_length = int(min_length * 1.2)
+            cv_clean = self.cleaning.run(
+                cv_raw, translation_callback=translate_to_english, profile=self.cleaning_profiles["cv"],
+                target_language="English", max_untranslated_length=max_untranslated_length
+            )
+            cv_timings = self.cleaning.last_timings
+            jd_clean = self.cleaning.run(
+                jd_raw, translation_callback=translate_to_english, profile=self.cleaning_profiles["jd"],
+                target_language="English", max_untranslated_length=max_untranslated_length
+            )
+            jd_timings = self.cleaning.last_timings
             stage_elapsed = time.time() - stage_start
             
             self.logger.info(f"✓ Text cleaned and translated successfully in {stage_elapsed:.2f}s")
             self.logger.info(f"  CV cleaned length: {len(cv_clean)} characters")
             self.logger.info(f"  JD cleaned length: {len(jd_clean)} characters")
+            for label, timings in (("CV", cv_timings), ("JD", jd_timings)):
+                self.logger.info(
+                    f"  {label} step timings ({self.cleaning_profiles[label.lower()]}): "
+                    + ", ".join(f"{name} {seconds:.3f}s" for name, seconds in timings.items())
+                )
+            self.logger.info(f"  Token caches: {self.cleaning.token_cache_stats()}")
+            self.logger.info(f"  Translation gate: {self.cleaning.translation_gate_stats()}")
+            self.logger.info(f"  Summary cache: {self.summary_translation.cache.stats()}")
 
             if on_step_progress:
                 on_step_progress("Text cleaning and translation completed", 40)
@@ -133,25 +241,26 @@ class RecruitmentPipeline:
             
             # ========== STAGE 3: STRUCTURED PROCESSING ==========
             self.logger.info("\n" + "=" * 80)
-            self.logger.info("STAGE 3: STRUCTURED PROCESSING (LLM Extraction)")
+            self.logger.info(f"STAGE 3: STRUCTURED PROCESSING (LLM Extraction, {self.extraction_mode} mode)")
             self.logger.info("=" * 80)
             
             stage_start = time.time()
             
-            self.logger.info("Processing CV...")
-            cv_structured = self.cv_processing.run(cv_clean, output_format="json")
+            # Section slices are cut from the layout-preserving text (the cleaned text is one line of tokens)
+            cv_layout, jd_layout = self._layout_text(cv_raw), self._layout_text(jd_raw)
+            cv_structured, jd_structured = self._extract_structured(cv_clean, jd_clean, cv_layout, jd_layout)
             cv_strings = self.cv_processing.flatten_objects_to_string(cv_structured)
-            
-            first_elapsed = time.time() - stage_start
-            self.logger.info(f"✓ CV structured extraction completed in {first_elapsed:.2f}s")
-
-            self.logger.info("Processing Job Description...")
-            jd_structured = self.desc_processing.run(jd_clean, output_format="json")
             jd_strings = self.desc_processing.flatten_objects_to_string(jd_structured)
-            self.logger.info(f"✓ JD structured extraction completed in {time.time() - stage_start - first_elapsed:.2f}s")
 
             stage_elapsed = time.time() - stage_start
             self.logger.info(f"✓ Structured extraction completed in {stage_elapsed:.2f}s")
+            for label, processing in (("CV", self.cv_processing), ("JD", self.desc_processing)):
+                usage = processing.last_usage
+                per_call = usage["prompt_tokens"] / usage["calls"] if usage["calls"] else 0
+                self.logger.info(
+                    f"  {label} extraction: {usage['calls']} calls, {usage['prompt_tokens']} prompt tokens "
+                    f"({per_call:.0f} per call), {usage['output_tokens']} output tokens"
+                )
             
             if on_step_progress:
                 on_step_progress("Structured extraction completed", 60)
@@ -190,6 +299,7 @@ class RecruitmentPipeline:
             
             self.logger.info(f"✓ Evaluation completed in {stage_elapsed:.2f}s")
             self.logger.info(f"  FINAL DECISION: {evaluation_report.decision.value}")
+            self.logger.info(f"  LLM clients: {LLMRegistry.stats()}")
 
             if on_step_progress:
                 on_step_progress("Final evaluation completed", 90)
@@ -0,0 +1,92 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from PIL import Image
+
+from main import retreival
+from main.retreival import Retreival
+
+PAGES = 3
+DOCUMENTS = 6
+TIMEOUT = 120
+
+# Stand-in for pytesseract imported by the spawned OCR workers (they do not see monkeypatching)
+FAKE_PYTESSERACT = '''
+class Output:
+    DICT = "dict"
+
+def image_to_string(image, lang="eng"):
+    return "scanned page"
+
+def get_tesseract_version():
+    return "fake"
+'''
+
+
+@pytest.fixture
+def scanned_pdfs(tmp_path, monkeypatch):
+    """
+    Image-only PDFs (every page needs OCR), with tesseract replaced in this process and in the workers.
+    """
+    fake_modules = tmp_path / "fake_modules"
+    fake_modules.mkdir()
+    (fake_modules / "pytesseract.py").write_text(FAKE_PYTESSERACT)
+    monkeypatch.syspath_prepend(str(fake_modules))
+    monkeypatch.setattr(retreival.pytesseract, "image_to_string", lambda image, lang="eng": "scanned page")
+
+    documents = tmp_path / "scans"
+    documents.mkdir()
+    for n in range(DOCUMENTS):
+        pages = [Image.new("L", (120, 160), 255) for _ in range(PAGES)]
+        pages[0].save(documents / f"scan{n}.pdf", save_all=True, append_images=pages[1:])
+    return documents
+
+
+def test_parallel_ocr_while_another_thread_holds_pdfium(scanned_pdfs, monkeypatch):
+    """
+    OCR workers started while another thread holds the pdfium lock must not inherit it
+    (forked workers did, and hung forever on their first render).
+    """
+    loader = Retreival(parallel=True, max_workers=2, ocr_engine="pytesseract")
+    ocr_pages_parallel = loader._ocr_pages_parallel
+    locked, finished = threading.Event(), threading.Event()
+
+    def hold_pdfium():
+        with retreival._PDFIUM_LOCK:
+            locked.set()
+            finished.wait(TIMEOUT)
+
+    def ocr_pages_while_locked(source, page_indices):
+        holder = threading.Thread(target=hold_pdfium, daemon=True)
+        holder.start()
+        locked.wait()
+        try:
+            return ocr_pages_parallel(source, page_indices)
+        finally:
+            finished.set()
+            holder.join()
+
+    monkeypatch.setattr(loader, "_ocr_pages_parallel", ocr_pages_while_locked)
+    path = str(next(scanned_pdfs.iterdir()))
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        text = executor.submit(loader.run, path).result(timeout=TIMEOUT)
+    assert text == "scanned page\n" * PAGES
+
+
+def test_parallel_ocr_from_threads(scanned_pdfs):
+    loader = Retreival(parallel=True, max_workers=2, ocr_engine="pytesseract")
+    paths = sorted(scanned_pdfs.iterdir())
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(loader.run, str(path)) for path in paths]
+        texts = [future.result(timeout=TIMEOUT) for future in futures]
+    assert texts == ["scanned page\n" * PAGES] * DOCUMENTS
+
+
+def test_run_many_with_parallel_ocr(scanned_pdfs):
+    loader = Retreival(parallel=True, max_workers=2, ocr_engine="pytesseract")
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        results = executor.submit(lambda: dict(loader.run_many(scanned_pdfs, max_workers=4))).result(timeout=TIMEOUT)
+    assert loader.ingestion_errors == []
+    assert sorted(results) == [str(path) for path in sorted(scanned_pdfs.iterdir())]
+    assert set(results.values()) == {"scanned page\n" * PAGES}